@@ -0,0 +1,229 @@
+"""
+Admission control for the expensive endpoints: token buckets per client IP.
+
+Each throttled endpoint belongs to a class with its own budget: 'ai' (a Gemini call per
+request) and 'email' (SMTP sends). Emergency processing and everything else is never
+throttled. A request must find a token in its IP bucket, otherwise it gets 429 with
+Retry-After. Buckets are keyed on the client address only: the API has no authenticated
+sessions, and a userId sent by the client would let anyone drain another user's bucket.
+Behind a reverse proxy, set TRUSTED_PROXY_HOPS so the address comes from X-Forwarded-For.
+
+Budgets are "<requests per minute>:<burst>" strings, e.g. ADMISSION_AI_IP=60:30.
+ADMISSION_BACKEND picks where bucket state lives:
+    memory   per process (default)
+    shared   one table in anonymous shared memory, created when the app is built, so
+             gunicorn workers forked from the preloading master share the same buckets
+    off      no admission control
+"""
+import hashlib
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from flask import jsonify, request
+from .metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+# endpoint -> class; endpoints not listed here are never throttled
+ENDPOINT_CLASSES = {
+    'ai.analyze_problem': 'ai',
+    'ai.recommend_schemes': 'ai',
+    'complaint.generate_complaint_draft': 'ai',
+    'voice.voice_to_text': 'ai',
+    'voice.analyze_with_gemini': 'ai',
+    'complaint.file_complaint': 'email',
+    'complaint.submit_feedback': 'email',
+}
+
+# Blueprints that must stay reachable whatever the budgets say
+NEVER_THROTTLED = ('emergency',)
+
+DEFAULT_BUDGETS = {
+    ('ai', 'ip'): '60:30',
+    ('email', 'ip'): '20:10',
+}
+
+BACKENDS = ('memory', 'shared', 'off')
+
+# Buckets idle this long are full again under any sane budget and can be forgotten
+IDLE_SECONDS = 3600
+
+ADMISSIONS = Counter(
+    'janai_admission_total', 'Admission decisions for throttled endpoints by class and outcome',
+    ('class', 'outcome')
+)
+
+
+class Budget:
+    """
+    Bucket size (burst) and refill rate (tokens per second)
+    """
+
+    def __init__(self, per_minute, burst):
+        if per_minute <= 0 or burst < 1:
+            raise ValueError('admission budgets need a positive rate and a burst of at least 1')
+        self.capacity = float(burst)
+        self.rate = per_minute / 60.0
+
+    @classmethod
+    def parse(cls, spec):
+        per_minute, _, burst = spec.partition(':')
+        return cls(float(per_minute), float(burst or per_minute))
+
+
+def load_budgets():
+    budgets = {}
+    for (endpoint_class, scope), default in DEFAULT_BUDGETS.items():
+        spec = os.getenv(f'ADMISSION_{endpoint_class.upper()}_{scope.upper()}', default)
+        budgets[(endpoint_class, scope)] = Budget.parse(spec)
+    return budgets
+
+
+def refill(tokens, updated, budget, now):
+    return min(budget.capacity, tokens + (now - updated) * budget.rate)
+
+
+class MemoryBackend:
+    """
+    Buckets in a dict: key -> [tokens, updated]
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.next_sweep = time.monotonic() + IDLE_SECONDS
+
+    def acquire(self, entries, now):
+        """
+        Take one token from every (key, budget) bucket, or from none of them.
+        Returns None when admitted, else (index of the first empty bucket, seconds until it has a token).
+        """
+        with self.lock:
+            if now >= self.next_sweep:
+                self.buckets = {key: bucket for key, bucket in self.buckets.items() if now - bucket[1] < IDLE_SECONDS}
+                self.next_sweep = now + IDLE_SECONDS
+            levels = []
+            for index, (key, budget) in enumerate(entries):
+                bucket = self.buckets.get(key)
+                tokens = budget.capacity if bucket is None else refill(bucket[0], bucket[1], budget, now)
+                if tokens < 1:
+                    return index, (1 - tokens) / budget.rate
+                levels.append(tokens)
+            for (key, _), tokens in zip(entries, levels):
+                self.buckets[key] = [tokens - 1, now]
+            return None
+
+
+class SharedBackend:
+    """
+    Fixed-size open-addressing table in an anonymous shared mapping.
+
+    Slots are (key hash, tokens, updated). A key lives in the first PROBES slots from its
+    hash; when they are all taken the least recently used one is reused, which at worst
+    hands an evicted client a full bucket. time.monotonic() is system-wide on Linux, so
+    timestamps written by one worker are valid in the others.
+    """
+
+    SLOT = struct.Struct('<Qdd')
+    PROBES = 8
+
+    def __init__(self, slots=None):
+        self.slots = slots or int(os.getenv('ADMISSION_SHARED_SLOTS', '65536'))
+        self.buffer = mmap.mmap(-1, self.slots * self.SLOT.size)
+        self.lock = multiprocessing.Lock()
+
+    @staticmethod
+    def key_hash(key):
+        # Never 0, which marks an empty slot
+        digest = hashlib.blake2b('\0'.join(key).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def _locate(self, key_hash):
+        """
+        (slot offset, tokens, updated); tokens is None for an empty or evicted slot
+        """
+        start = key_hash % self.slots
+        victim, oldest = None, math.inf
+        for probe in range(self.PROBES):
+            offset = ((start + probe) % self.slots) * self.SLOT.size
+            stored_hash, tokens, updated = self.SLOT.unpack_from(self.buffer, offset)
+            if stored_hash == key_hash:
+                return offset, tokens, updated
+            if stored_hash == 0:
+                return offset, None, None
+            if updated < oldest:
+                victim, oldest = offset, updated
+        return victim, None, None
+
+    def acquire(self, entries, now):
+        with self.lock:
+            found = []
+            for index, (key, budget) in enumerate(entries):
+                key_hash = self.key_hash(key)
+                offset, tokens, updated = self._locate(key_hash)
+                tokens = budget.capacity if tokens is None else refill(tokens, updated, budget, now)
+                if tokens < 1:
+                    return index, (1 - tokens) / budget.rate
+                found.append((offset, key_hash, tokens))
+            for offset, key_hash, tokens in found:
+                self.SLOT.pack_into(self.buffer, offset, key_hash, tokens - 1, now)
+            return None
+
+
+def _client_ip():
+    # The proxy's X-Forwarded-For entry once the app is wrapped in ProxyFix (TRUSTED_PROXY_HOPS)
+    return request.remote_addr or 'unknown'
+
+
+class AdmissionController:
+    def __init__(self, backend, budgets):
+        self.backend = backend
+        self.budgets = budgets
+
+    def check(self):
+        """
+        before_request hook: None to admit, a 429 response to reject
+        """
+        if request.method == 'OPTIONS' or request.blueprint in NEVER_THROTTLED:
+            return None
+        endpoint_class = ENDPOINT_CLASSES.get(request.endpoint)
+        if endpoint_class is None:
+            return None
+
+        entries = [((endpoint_class, 'ip', _client_ip()), self.budgets[(endpoint_class, 'ip')])]
+        rejected = self.backend.acquire(entries, time.monotonic())
+        if rejected is None:
+            ADMISSIONS.inc(endpoint_class, 'admitted')
+            return None
+
+        _, wait = rejected
+        ADMISSIONS.inc(endpoint_class, 'throttled_ip')
+        retry_after = max(1, math.ceil(wait))
+        response = jsonify({
+            'error': f'Too many requests, please try again in {retry_after} seconds',
+            'retryAfter': retry_after
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_after)
+        return response
+
+
+def init_admission(app):
+    """
+    Throttle the AI and email endpoints (ADMISSION_BACKEND=off disables)
+    """
+    backend_name = os.getenv('ADMISSION_BACKEND', 'memory')
+    if backend_name not in BACKENDS:
+        raise ValueError(f"ADMISSION_BACKEND must be one of {', '.join(BACKENDS)}, got {backend_name!r}")
+    if backend_name == 'off':
+        return None
+    backend = SharedBackend() if backend_name == 'shared' else MemoryBackend()
+    controller = AdmissionController(backend, load_budgets())
+    app.before_request(controller.check)
+    logger.info("🚦 Admission control on (%s buckets) for %d AI/email endpoints", backend_name, len(ENDPOINT_CLASSES))
+    return controller
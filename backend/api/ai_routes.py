@@ -1,217 +1,23 @@
 from flask import Blueprint, request, jsonify
 import json
+import logging
 import re
 import os
+from .gemini_metrics import track_gemini_call, failure_outcome, get_gemini_stats
+from .scheme_buckets import get_all_schemes, find_schemes_for_profile
+from .classification_rules import get_rules
+from .complaint_classifier import is_confident, predict_category
+from .helpline_directory import get_directory
 
-ai_bp = Blueprint('ai', __name__)
-
-def get_state_emergency_numbers(state):
-    """
-    Get state-specific emergency numbers based on the state
-    """
-    state_lower = state.lower()
-    
-    # State-specific emergency numbers
-    state_numbers = {
-        'uttar pradesh': [
-            'Call 108 for ambulance (UP specific)',
-            'Call 100 for police (UP)',
-            'Call 101 for fire (UP)'
-        ],
-        'maharashtra': [
-            'Call 108 for ambulance (Maharashtra)',
-            'Call 104 for fire/medical (Maharashtra)',
-            'Call 100 for police (Maharashtra)'
-        ],
-        'karnataka': [
-            'Call 104 for medical advice (Arogyavani)',
-            'Call 108 for ambulance (Karnataka)',
-            'Call 100 for police (Karnataka)'
-        ],
-        'delhi': [
-            'Call 102 for ambulance (Delhi)',
-            'Call 100 for police (Delhi)',
-            'Call 101 for fire (Delhi)'
-        ],
-        'tamil nadu': [
-            'Call 108 for ambulance (Tamil Nadu)',
-            'Call 100 for police (Tamil Nadu)',
-            'Call 101 for fire (Tamil Nadu)'
-        ],
-        'gujarat': [
-            'Call 108 for ambulance (Gujarat)',
-            'Call 100 for police (Gujarat)',
-            'Call 101 for fire (Gujarat)'
-        ],
-        'west bengal': [
-            'Call 108 for ambulance (West Bengal)',
-            'Call 100 for police (West Bengal)',
-            'Call 101 for fire (West Bengal)'
-        ],
-        'andhra pradesh': [
-            'Call 108 for ambulance (Andhra Pradesh)',
-            'Call 100 for police (Andhra Pradesh)',
-            'Call 101 for fire (Andhra Pradesh)'
-        ],
-        'telangana': [
-            'Call 108 for ambulance (Telangana)',
-            'Call 100 for police (Telangana)',
-            'Call 101 for fire (Telangana)'
-        ],
-        'kerala': [
-            'Call 108 for ambulance (Kerala)',
-            'Call 100 for police (Kerala)',
-            'Call 101 for fire (Kerala)'
-        ]
-    }
-    
-    # Return state-specific numbers if available, otherwise return general numbers
-    return state_numbers.get(state_lower, [
-        'Call 108 for ambulance (state-specific)',
-        'Call 100 for police (state-specific)',
-        'Call 101 for fire (state-specific)'
-    ])
+logger = logging.getLogger(__name__)
 
-def get_language_specific_helplines(language, state):
-    """
-    Get language-specific helpline recommendations
-    """
-    language_lower = language.lower()
-    state_lower = state.lower()
-    
-    # Language-specific helpline messages
-    language_messages = {
-        'hindi': {
-            'delhi': [
-                'दिल्ली पुलिस हेल्पलाइन: 100',
-                'दिल्ली एम्बुलेंस: 102',
-                'दिल्ली फायर ब्रिगेड: 101'
-            ],
-            'maharashtra': [
-                'महाराष्ट्र पुलिस हेल्पलाइन: 100',
-                'महाराष्ट्र एम्बुलेंस: 108',
-                'महाराष्ट्र फायर ब्रिगेड: 101'
-            ],
-            'uttar pradesh': [
-                'उत्तर प्रदेश पुलिस हेल्पलाइन: 100',
-                'उत्तर प्रदेश एम्बुलेंस: 108',
-                'उत्तर प्रदेश फायर ब्रिगेड: 101'
-            ],
-            'general': [
-                'आपातकालीन सहायता: 112',
-                'पुलिस हेल्पलाइन: 100',
-                'एम्बुलेंस: 102/108',
-                'फायर ब्रिगेड: 101'
-            ]
-        },
-        'bengali': {
-            'west bengal': [
-                'পশ্চিমবঙ্গ পুলিশ হেল্পলাইন: 100',
-                'পশ্চিমবঙ্গ অ্যাম্বুলেন্স: 108',
-                'পশ্চিমবঙ্গ ফায়ার ব্রিগেড: 101'
-            ],
-            'general': [
-                'জরুরি সাহায্য: 112',
-                'পুলিশ হেল্পলাইন: 100',
-                'অ্যাম্বুলেন্স: 102/108',
-                'ফায়ার ব্রিগেড: 101'
-            ]
-        },
-        'tamil': {
-            'tamil nadu': [
-                'தமிழ்நாடு காவல்துறை ஹெல்ப்லைன்: 100',
-                'தமிழ்நாடு ஆம்புலன்ஸ்: 108',
-                'தமிழ்நாடு தீயணைப்பு பிரிகேட்: 101'
-            ],
-            'general': [
-                'அவசர உதவி: 112',
-                'காவல்துறை ஹெல்ப்லைன்: 100',
-                'ஆம்புலன்ஸ்: 102/108',
-                'தீயணைப்பு பிரிகேட்: 101'
-            ]
-        },
-        'telugu': {
-            'andhra pradesh': [
-                'ఆంధ్రప్రదేశ్ పోలీసు హెల్ప్‌లైన్: 100',
-                'ఆంధ్రప్రదేశ్ ఆంబులెన్స్: 108',
-                'ఆంధ్రప్రదేశ్ అగ్నిమాపక బ్రిగేడ్: 101'
-            ],
-            'telangana': [
-                'తెలంగాణ పోలీసు హెల్ప్‌లైన్: 100',
-                'తెలంగాణ ఆంబులెన్స్: 108',
-                'తెలంగాణ అగ్నిమాపక బ్రిగేడ్: 101'
-            ],
-            'general': [
-                'విపత్తు సహాయం: 112',
-                'పోలీసు హెల్ప్‌లైన్: 100',
-                'ఆంబులెన్స్: 102/108',
-                'అగ్నిమాపక బ్రిగేడ్: 101'
-            ]
-        },
-        'gujarati': {
-            'gujarat': [
-                'ગુજરાત પોલીસ હેલ્પલાઈન: 100',
-                'ગુજરાત એમ્બ્યુલન્સ: 108',
-                'ગુજરાત ફાયર બ્રિગેડ: 101'
-            ],
-            'general': [
-                'કટોકટી સહાય: 112',
-                'પોલીસ હેલ્પલાઈન: 100',
-                'એમ્બ્યુલન્સ: 102/108',
-                'ફાયર બ્રિગેડ: 101'
-            ]
-        },
-        'marathi': {
-            'maharashtra': [
-                'महाराष्ट्र पोलीस हेल्पलाईन: 100',
-                'महाराष्ट्र एम्ब्युलन्स: 108',
-                'महाराष्ट्र फायर ब्रिगेड: 101'
-            ],
-            'general': [
-                'आणीबाळ मदत: 112',
-                'पोलीस हेल्पलाईन: 100',
-                'एम्ब्युलन्स: 102/108',
-                'फायर ब्रिगेड: 101'
-            ]
-        },
-        'kannada': {
-            'karnataka': [
-                'ಕರ್ನಾಟಕ ಪೊಲೀಸ್ ಹೆಲ್ಪ್‌ಲೈನ್: 100',
-                'ಕರ್ನಾಟಕ ಆಂಬ್ಯುಲೆನ್ಸ್: 108',
-                'ಕರ್ನಾಟಕ ಅಗ್ನಿಮಾಪಕ ಬ್ರಿಗೇಡ್: 101'
-            ],
-            'general': [
-                'ತುರ್ತು ಸಹಾಯ: 112',
-                'ಪೊಲೀಸ್ ಹೆಲ್ಪ್‌ಲೈನ್: 100',
-                'ಆಂಬ್ಯುಲೆನ್ಸ್: 102/108',
-                'ಅಗ್ನಿಮಾಪಕ ಬ್ರಿಗೇಡ್: 101'
-            ]
-        },
-        'malayalam': {
-            'kerala': [
-                'കേരള പോലീസ് ഹെൽപ്പ്‌ലൈൻ: 100',
-                'കേരള ആംബുലൻസ്: 108',
-                'കേരള ഫയർ ബ്രിഗേഡ്: 101'
-            ],
-            'general': [
-                'അടിയന്തിര സഹായം: 112',
-                'പോലീസ് ഹെൽപ്പ്‌ലൈൻ: 100',
-                'ആംബുലൻസ്: 102/108',
-                'ഫയർ ബ്രിഗേഡ്: 101'
-            ]
-        }
-    }
-    
-    # Get language-specific messages
-    lang_messages = language_messages.get(language_lower, {})
-    
-    # Return state-specific messages if available, otherwise return general messages
-    return lang_messages.get(state_lower, lang_messages.get('general', []))
+ai_bp = Blueprint('ai', __name__)
 
 def analyze_problem_with_gemini(description, language, state):
     """
     Analyze problem using real Gemini AI with improved error handling and multi-language support
     """
+    call = track_gemini_call('problem_analysis')
     try:
         import google.generativeai as genai
         import time
@@ -270,11 +76,14 @@ Always include 112 for emergencies and provide specific, actionable recommendati
         
         # Generate response from Gemini with timeout
         start_time = time.time()
+        call.begin(prompt)
         response = model.generate_content(prompt)
         ai_response = response.text
+        call.response_received(ai_response, response)
         
         # Check if response took too long
         if time.time() - start_time > 30:  # 30 second timeout
+            call.finish('timeout')
             raise Exception("AI response timeout")
         
         # Parse the JSON response
@@ -292,10 +101,12 @@ Always include 112 for emergencies and provide specific, actionable recommendati
                 if field not in analysis_result:
                     analysis_result[field] = 'General' if field == 'problemType' else ''
             
+            call.finish('ok')
             return analysis_result
             
         except json.JSONDecodeError:
             # Fallback if JSON parsing fails
+            call.finish('parse_failure')
             return {
                 'problemType': 'General',
                 'suggestedState': state,
@@ -308,7 +119,8 @@ Always include 112 for emergencies and provide specific, actionable recommendati
             }
         
     except Exception as e:
-        print(f"Gemini AI Error: {e}")
+        logger.warning("Gemini problem analysis failed, using keyword fallback: %s", e)
+        call.finish(failure_outcome(e))
         # Use intelligent fallback analysis based on keywords
         return intelligent_fallback_analysis(description, language, state, str(e))
 
@@ -318,33 +130,13 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
     """
     description_lower = description.lower()
     
-    # Women safety analysis - Multi-language support
-    women_keywords = [
-        'woman', 'women', 'female', 'girl', 'ladies',
-        'महिला', 'स्त्री', 'लड़की', 'औरत', 'नारी',
-        'பெண்', 'பெண்கள்', 'பெண் குழந்தை',
-        'స్త్రీ', 'మహిళ', 'అమ్మాయి',
-        'মহিলা', 'নারী', 'মেয়ে',
-        'बाई', 'स्त्री', 'महिला'
-    ]
-    harassment_keywords = [
-        'harassment', 'harassing', 'harassed', 'molestation', 'stalking', 'eve teasing',
-        'छेड़छाड़', 'परेशानी', 'उत्पीड़न', 'दुर्व्यवहार', 'हिंसा',
-        'வேட்டை', 'துன்புறுத்தல்', 'கொடுமை',
-        'వేధింపులు', 'అవమానం', 'దుర్వినియోగం',
-        'নির্যাতন', 'উৎপীড়ন', 'অত্যাচার'
-    ]
-    violence_keywords = [
-        'violence', 'abuse', 'domestic', 'beating', 'threat', 'intimidation',
-        'हिंसा', 'मारपीट', 'धमकी', 'अत्याचार', 'दुर्व्यवहार',
-        'வன்முறை', 'அடி', 'மிரட்டல்',
-        'హింస', 'చావగొట్టడం', 'ముప్పు',
-        'সহিংসতা', 'মারধর', 'ধমক'
-    ]
+    # Single pass over the description for all keyword categories from the rules registry
+    found = get_rules().problem_matcher.categories(description_lower)
     
-    is_woman_mentioned = any(keyword in description_lower for keyword in women_keywords)
-    is_harassment_mentioned = any(keyword in description_lower for keyword in harassment_keywords)
-    is_violence_mentioned = any(keyword in description_lower for keyword in violence_keywords)
+    # Women safety analysis
+    is_woman_mentioned = 'women' in found
+    is_harassment_mentioned = 'harassment' in found
+    is_violence_mentioned = 'violence' in found
     
     if is_woman_mentioned and (is_harassment_mentioned or is_violence_mentioned):
         return {
@@ -364,27 +156,9 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
             'context': 'Using intelligent analysis due to network issues'
         }
     
-    # Child protection analysis - Multi-language support
-    child_keywords = [
-        'child', 'children', 'minor', 'kid', 'boy', 'girl', 'student',
-        'बच्चा', 'बच्चे', 'बच्ची', 'लड़का', 'लड़की', 'शिशु', 'बालक', 'बालिका',
-        'குழந்தை', 'பிள்ளை', 'மகன்', 'மகள்',
-        'పిల్లలు', 'బిడ్డ', 'కుమారుడు', 'కుమార్తె',
-        'শিশু', 'ছেলে', 'মেয়ে', 'সন্তান',
-        'बालक', 'बालिका', 'मुलगा', 'मुलगी'
-    ]
-    child_abuse_keywords = [
-        'abuse', 'molestation', 'exploitation', 'trafficking', 'neglect', 
-        'harassment', 'harassing', 'harassed', 'slave', 'slavery', 
-        'mistreatment', 'beating', 'threat',
-        'मजदूर', 'शोषण', 'दुर्व्यवहार', 'गुलाम', 'पीटना', 'धमकी', 'अत्याचार',
-        'கொடுமை', 'வன்முறை', 'சுரண்டல்', 'அடிமை',
-        'దుర్వినియోగం', 'వేధింపులు', 'గులాము', 'చావగొట్టడం',
-        'নির্যাতন', 'শোষণ', 'দাসত্ব', 'মারধর'
-    ]
-    
-    is_child_mentioned = any(keyword in description_lower for keyword in child_keywords)
-    is_child_abuse_mentioned = any(keyword in description_lower for keyword in child_abuse_keywords)
+    # Child protection analysis
+    is_child_mentioned = 'child' in found
+    is_child_abuse_mentioned = 'child_abuse' in found
     
     if is_child_mentioned and is_child_abuse_mentioned:
         return {
@@ -405,7 +179,7 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
         }
     
     # General child help cases
-    if is_child_mentioned and ('help' in description_lower or 'want to help' in description_lower or 'need help' in description_lower or 'मदद' in description_lower or 'सहायता' in description_lower or 'बचाना' in description_lower):
+    if is_child_mentioned and 'help_request' in found:
         return {
             'problemType': 'Child Protection',
             'suggestedState': state,
@@ -423,29 +197,14 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
             'context': 'Using intelligent analysis due to network issues'
         }
     
-    # Transport analysis - Multi-language support
-    transport_keywords = [
-        'highway', 'road', 'petrol', 'fuel', 'gas', 'vehicle', 'car', 'bike', 'bus', 'truck', 'transport', 'travel', 'journey', 'trip',
-        'सड़क', 'पेट्रोल', 'गाड़ी', 'वाहन', 'यात्रा', 'रास्ता',
-        'சாலை', 'பெட்ரோல்', 'வாகனம்', 'பயணம்',
-        'రోడ్', 'పెట్రోల్', 'వాహనం', 'ప్రయాణం',
-        'সড়ক', 'পেট্রোল', 'গাড়ি', 'যাত্রা'
-    ]
-    emergency_transport_keywords = [
-        'accident', 'breakdown', 'stuck', 'emergency', 'help', 'assistance',
-        'एक्सीडेंट', 'दुर्घटना', 'मदद', 'आपातकाल', 'ब्रेकडाउन', 'फंस गया',
-        'விபத்து', 'உதவி', 'அவசரம்', 'சிக்கல்',
-        'ప్రమాదం', 'సహాయం', 'తక్షణం', 'అడ్డుపడింది',
-        'দুর্ঘটনা', 'সাহায্য', 'জরুরি', 'আটকে গেছে'
-    ]
-    
-    is_transport_mentioned = any(keyword in description_lower for keyword in transport_keywords)
-    is_emergency_transport = any(keyword in description_lower for keyword in emergency_transport_keywords)
+    # Transport analysis
+    is_transport_mentioned = 'transport' in found
+    is_emergency_transport = 'emergency_transport' in found
     
     # Check for transport emergency first (accident, breakdown, etc.)
     if is_emergency_transport:
         # State-specific emergency numbers
-        state_emergency_numbers = get_state_emergency_numbers(state)
+        state_emergency_numbers = get_directory().recommended_numbers(state)
         
         return {
             'problemType': 'Transport Emergency',
@@ -485,31 +244,14 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
             'context': 'Using intelligent analysis due to network issues'
         }
     
-    # Healthcare analysis - Multi-language support
-    health_keywords = [
-        'health', 'medical', 'hospital', 'doctor', 'ambulance', 'covid', 'fever', 'pain', 'sick', 'medicine', 'treatment',
-        'स्वास्थ्य', 'मेडिकल', 'हॉस्पिटल', 'डॉक्टर', 'एम्बुलेंस', 'बुखार', 'दर्द', 'बीमार', 'दवा', 'इलाज',
-        'சுகாதாரம்', 'மருத்துவம்', 'மருத்துவமனை', 'மருத்துவர்', 'ஆம்புலன்ஸ்', 'காய்ச்சல்', 'வலி', 'நோய்', 'மருந்து', 'சிகிச்சை',
-        'ఆరోగ్యం', 'వైద్యం', 'ఆసుపత్రి', 'డాక్టర్', 'ఆంబులెన్స్', 'జ్వరం', 'నొప్పి', 'అనారోగ్యం', 'మందు', 'చికిత్స',
-        'স্বাস্থ্য', 'চিকিৎসা', 'হাসপাতাল', 'ডাক্তার', 'অ্যাম্বুলেন্স', 'জ্বর', 'ব্যথা', 'অসুস্থ', 'ঔষধ', 'চিকিৎসা',
-        'आरोग्य', 'वैद्यकीय', 'रुग्णालय', 'वैद्य', 'रुग्णवाहिका', 'ताप', 'वेदना', 'आजारी', 'औषध', 'उपचार'
-    ]
-    emergency_health_keywords = [
-        'emergency', 'critical', 'unconscious', 'bleeding', 'heart attack', 'stroke', 'accident', 'injury',
-        'आपातकाल', 'गंभीर', 'बेहोश', 'खून बह रहा', 'हार्ट अटैक', 'स्ट्रोक', 'दुर्घटना', 'चोट',
-        'அவசரம்', 'கடுமையான', 'உணர்வற்ற', 'இரத்தம்', 'இதய நோய்', 'பக்கவாதம்', 'விபத்து', 'காயம்',
-        'తక్షణం', 'క్లిష్టమైన', 'అపస్మారకం', 'రక్తం', 'గుండెపోటు', 'పక్షవాతం', 'ప్రమాదం', 'గాయం',
-        'জরুরি', 'গুরুতর', 'অচেতন', 'রক্তপাত', 'হার্ট অ্যাটাক', 'স্ট্রোক', 'দুর্ঘটনা', 'আঘাত',
-        'आणीबाळ', 'गंभीर', 'बेशुद्ध', 'रक्तस्त्राव', 'हृदयविकार', 'पक्षघात', 'अपघात', 'जखम'
-    ]
-    
-    is_health_mentioned = any(keyword in description_lower for keyword in health_keywords)
-    is_emergency_health = any(keyword in description_lower for keyword in emergency_health_keywords)
+    # Healthcare analysis
+    is_health_mentioned = 'health' in found
+    is_emergency_health = 'emergency_health' in found
     
     if is_health_mentioned:
         if is_emergency_health:
             # State-specific emergency numbers
-            state_emergency_numbers = get_state_emergency_numbers(state)
+            state_emergency_numbers = get_directory().recommended_numbers(state)
             
             return {
                 'problemType': 'Medical Emergency',
@@ -544,48 +286,8 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
                 'context': 'Using intelligent analysis due to network issues'
             }
     
-    # Water issues - Multi-language support
-    water_keywords = [
-        'water', 'supply', 'shortage', 'leak', 'pipe', 'drinking', 'tank', 'tap',
-        'पानी', 'आपूर्ति', 'कमी', 'रिसाव', 'पाइप', 'पीने का', 'टैंक', 'नल',
-        'தண்ணீர்', 'விநியோகம்', 'பற்றாக்குறை', 'கசிவு', 'குழாய்', 'குடிநீர்', 'தொட்டி', 'குழாய்',
-        'నీరు', 'సరఫరా', 'పొట్టు', 'రావడం', 'పైపు', 'త్రాగడానికి', 'ట్యాంక్', 'బోరు',
-        'জল', 'সরবরাহ', 'স্বল্পতা', 'ফুটো', 'পাইপ', 'পানীয়', 'ট্যাঙ্ক', 'কল',
-        'पाणी', 'पुरवठा', 'उणीव', 'गळती', 'पाईप', 'पिण्याचे', 'टाकी', 'नळ'
-    ]
-    
-    # Electricity issues - Multi-language support
-    electricity_keywords = [
-        'electricity', 'power', 'current', 'voltage', 'wire', 'switch', 'meter', 'bill',
-        'बिजली', 'विद्युत', 'करंट', 'वोल्टेज', 'तार', 'स्विच', 'मीटर', 'बिल',
-        'மின்சாரம்', 'மின்', 'மின்னோட்டம்', 'மின்னழுத்தம்', 'கம்பி', 'சுவிட்ச்', 'மீட்டர்', 'பில்',
-        'విద్యుత్', 'పవర్', 'కరెంట్', 'వోల్టేజ్', 'వైర్', 'స్విచ్', 'మీటర్', 'బిల్లు',
-        'বিদ্যুৎ', 'পাওয়ার', 'কারেন্ট', 'ভোল্টেজ', 'তারের', 'সুইচ', 'মিটার', 'বিল',
-        'वीज', 'विद्युत', 'प्रवाह', 'व्होल्टेज', 'तार', 'स्विच', 'मीटर', 'बिल'
-    ]
-    
-    # Police issues - Multi-language support
-    police_keywords = [
-        'police', 'crime', 'theft', 'robbery', 'fraud', 'complaint', 'fir', 'investigation',
-        'पुलिस', 'अपराध', 'चोरी', 'डकैती', 'धोखाधड़ी', 'शिकायत', 'एफआईआर', 'जांच',
-        'காவல்துறை', 'குற்றம்', 'திருட்டு', 'கொள்ளை', 'மோசடி', 'புகார்', 'எஃப்ஐஆர்', 'விசாரணை',
-        'పోలీసు', 'నేరం', 'దొంగతనం', 'దోపిడీ', 'మోసం', 'ఫిర్యాదు', 'ఎఫ్ఐఆర్', 'విచారణ',
-        'পুলিশ', 'অপরাধ', 'চুরি', 'ডাকাতি', 'জালিয়াতি', 'অভিযোগ', 'এফআইআর', 'তদন্ত',
-        'पोलीस', 'गुन्हा', 'चोरी', 'दरोडा', 'फसवणूक', 'तक्रार', 'एफआयआर', 'चौकशी'
-    ]
-    
-    # Fire emergency - Multi-language support
-    fire_keywords = [
-        'fire', 'burning', 'smoke', 'flame', 'blaze', 'firefighter', 'rescue',
-        'आग', 'जल रहा', 'धुआं', 'लौ', 'ज्वाला', 'अग्निशमक', 'बचाव',
-        'தீ', 'எரிகிறது', 'புகை', 'சுடர்', 'சுடர்', 'தீயணைப்பு', 'காப்பாற்றல்',
-        'అగ్ని', 'మండుతున్న', 'పొగ', 'జ్వాల', 'జ్వాల', 'అగ్నిమాపక', 'రక్షణ',
-        'আগুন', 'জ্বলছে', 'ধোঁয়া', 'শিখা', 'শিখা', 'অগ্নিনির্বাপক', 'উদ্ধার',
-        'आग', 'जळत आहे', 'धूर', 'शिखा', 'शिखा', 'अग्निशमन', 'बचाव'
-    ]
-    
     # Check for water issues
-    is_water_mentioned = any(keyword in description_lower for keyword in water_keywords)
+    is_water_mentioned = 'water' in found
     if is_water_mentioned:
         return {
             'problemType': 'Water Supply',
@@ -605,11 +307,10 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
         }
     
     # Check for electricity issues
-    is_electricity_mentioned = any(keyword in description_lower for keyword in electricity_keywords)
+    is_electricity_mentioned = 'electricity' in found
     if is_electricity_mentioned:
         # Check if Delhi is mentioned for specific Delhi power companies
-        delhi_keywords = ['delhi', 'दिल्ली', 'டெல்லி', 'దిల్లీ', 'দিল্লি', 'दिल्ली']
-        is_delhi_mentioned = any(keyword in description_lower for keyword in delhi_keywords)
+        is_delhi_mentioned = 'delhi' in found
         
         if is_delhi_mentioned or state.lower() == 'delhi':
             return {
@@ -649,10 +350,10 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
             }
     
     # Check for police/crime issues
-    is_police_mentioned = any(keyword in description_lower for keyword in police_keywords)
+    is_police_mentioned = 'police' in found
     if is_police_mentioned:
         # State-specific emergency numbers
-        state_emergency_numbers = get_state_emergency_numbers(state)
+        state_emergency_numbers = get_directory().recommended_numbers(state)
         
         return {
             'problemType': 'Crime/Police',
@@ -673,10 +374,10 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
         }
     
     # Check for fire emergency
-    is_fire_mentioned = any(keyword in description_lower for keyword in fire_keywords)
+    is_fire_mentioned = 'fire' in found
     if is_fire_mentioned:
         # State-specific emergency numbers
-        state_emergency_numbers = get_state_emergency_numbers(state)
+        state_emergency_numbers = get_directory().recommended_numbers(state)
         
         return {
             'problemType': 'Fire Emergency',
@@ -708,6 +409,32 @@ def intelligent_fallback_analysis(description, language, state, error_msg):
         'context': 'Using intelligent analysis due to network issues'
     }
 
+def classifier_analysis(description, language, state, suggestion):
+    """
+    Analysis built around a confident classifier category, or None when the keyword
+    analysis points somewhere else (then Gemini decides)
+    """
+    category = suggestion['category']
+    analysis_result = intelligent_fallback_analysis(description, language, state, None)
+    if analysis_result['suggestedIssue'] == category:
+        analysis_result['context'] = 'Category suggested by the local complaint classifier'
+        return analysis_result
+    if analysis_result['problemType'] != 'General':
+        return None
+    return {
+        'problemType': category,
+        'suggestedState': state,
+        'suggestedIssue': category,
+        'priority': 'Medium',
+        'recommendations': [
+            f'Report the {category.lower()} problem to your municipal corporation',
+            'Contact 112 for emergency assistance'
+        ],
+        'confidence': suggestion['confidence'],
+        'aiAnalysis': f'Local complaint classifier matched this to {category}',
+        'context': 'Category suggested by the local complaint classifier'
+    }
+
 @ai_bp.route('/analyze-problem', methods=['POST'])
 def analyze_problem():
     try:
@@ -716,8 +443,18 @@ def analyze_problem():
         language = data.get('language', 'en-IN')
         state = data.get('state', 'India')
         
-        # Use real AI analysis
-        analysis_result = analyze_problem_with_gemini(description, language, state)
+        # Local category suggestion first; only pay for Gemini when it is unsure
+        suggestion = predict_category(description)
+        analysis_result = None
+        if suggestion and is_confident(suggestion):
+            analysis_result = classifier_analysis(description, language, state, suggestion)
+        if analysis_result is None:
+            # Use real AI analysis
+            analysis_result = analyze_problem_with_gemini(description, language, state)
+        
+        if suggestion:
+            analysis_result['suggestedCategory'] = suggestion['category']
+            analysis_result['categoryConfidence'] = suggestion['confidence']
         
         return jsonify(analysis_result)
         
@@ -731,15 +468,25 @@ def recommend_schemes():
     """
     try:
         data = request.get_json()
-        problem_description = data.get('problemDescription', '')
-        user_profile = data.get('userProfile', {})
+        problem_description = data.get('problemDescription') or ''
+        user_profile = data.get('userProfile') or {}
         language = data.get('language', 'en-IN')
         
-        # Load available schemes
-        with open('data/schemes.json', 'r') as f:
-            schemes_data = json.load(f)
+        # Profile-only requests are served from the precomputed bucket table
+        if not problem_description.strip():
+            recommended_schemes = find_schemes_for_profile(
+                user_profile.get('occupation'),
+                user_profile.get('gender'),
+                user_profile.get('age')
+            )
+            return jsonify({
+                'recommendedSchemes': recommended_schemes,
+                'total': len(recommended_schemes),
+                'aiAnalysis': 'Recommended government schemes based on your profile'
+            })
         
-        schemes = schemes_data.get('schemes', [])
+        # Load available schemes
+        schemes = get_all_schemes()
         
         # Use AI to analyze and recommend schemes
         recommended_schemes = recommend_schemes_with_gemini(
@@ -758,10 +505,25 @@ def recommend_schemes():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def profile_fallback_schemes(user_profile, schemes, limit=5):
+    """
+    Top precomputed matches for the user's profile bucket, or the first schemes if there is no profile
+    """
+    if user_profile:
+        matches = find_schemes_for_profile(
+            user_profile.get('occupation'),
+            user_profile.get('gender'),
+            user_profile.get('age')
+        )
+        if matches:
+            return matches[:limit]
+    return schemes[:limit]
+
 def recommend_schemes_with_gemini(problem_description, user_profile, schemes, language):
     """
     Use Gemini AI to recommend relevant government schemes
     """
+    call = track_gemini_call('scheme_recommendation')
     try:
         import google.generativeai as genai
         
@@ -828,8 +590,10 @@ Analyze thoroughly and provide the most helpful scheme recommendations.
         """
         
         # Generate response from Gemini
+        call.begin(prompt)
         response = model.generate_content(prompt)
         ai_response = response.text
+        call.response_received(ai_response, response)
         
         # Parse the JSON response
         try:
@@ -843,16 +607,26 @@ Analyze thoroughly and provide the most helpful scheme recommendations.
             if 'recommendedSchemes' not in recommendation_result:
                 recommendation_result['recommendedSchemes'] = []
             
+            call.finish('ok')
             return recommendation_result['recommendedSchemes']
             
         except json.JSONDecodeError:
             # Fallback to basic scheme matching
-            return schemes[:5]  # Return first 5 schemes as fallback
+            call.finish('parse_failure')
+            return profile_fallback_schemes(user_profile, schemes)  # Top profile matches as fallback
         
     except Exception as e:
-        print(f"Gemini AI Scheme Recommendation Error: {e}")
+        logger.warning("Gemini scheme recommendation failed, using profile fallback: %s", e)
+        call.finish(failure_outcome(e))
         # Return fallback recommendations
-        return schemes[:5]
+        return profile_fallback_schemes(user_profile, schemes)
+
+@ai_bp.route('/usage-stats', methods=['GET'])
+def usage_stats():
+    """
+    Per-prompt token, latency, outcome and cost accounting for Gemini calls
+    """
+    return jsonify(get_gemini_stats())
 
 @ai_bp.route('/health', methods=['GET'])
 def health_check():
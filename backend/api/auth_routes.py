@@ -1,16 +1,17 @@
 from flask import Blueprint, request, jsonify
-import json
 import os
+from .catalog import data_path
+from .json_provider import read_json, write_json
 
 auth_bp = Blueprint('auth', __name__)
 
+USERS_FILE = data_path('users.json')
+
 def load_users():
-    with open('data/users.json', 'r') as f:
-        return json.load(f)
+    return read_json(USERS_FILE)
 
 def save_users(users):
-    with open('data/users.json', 'w') as f:
-        json.dump(users, f, indent=2)
+    write_json(USERS_FILE, users)
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
@@ -0,0 +1,172 @@
+"""
+Catalog manager: read-mostly data files (schemes, helplines, classification rules) loaded
+once into immutable, versioned snapshots.
+
+Each catalog names its data files and a build function that turns the parsed JSON into
+lookup structures. A background watcher stats the files every CATALOG_WATCH_INTERVAL
+seconds and, when any changed, builds a new snapshot and swaps it in with one assignment:
+request handlers read the current snapshot without touching the filesystem and never
+see a half-built one. A file that fails to parse is reported and the previous snapshot
+stays active.
+
+Paths are resolved against the backend directory, not the process working directory.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from .json_provider import loads
+from .metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BACKEND_DIR, 'data')
+
+# version counts reloads in this process; digest identifies the file contents across processes
+Snapshot = namedtuple('Snapshot', ['name', 'version', 'digest', 'value', 'mtimes', 'loaded_at'])
+
+
+def data_path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+class Catalog:
+    """
+    One or more data files and the structure built from them
+    """
+
+    def __init__(self, name, paths, build):
+        self.name = name
+        self.paths = tuple(paths)
+        self.build = build
+        self._snapshot = None
+        self._failed_mtimes = None
+        self._lock = threading.Lock()
+
+    def _file_mtimes(self):
+        return tuple(os.path.getmtime(path) for path in self.paths)
+
+    def _load(self, version):
+        # mtimes are taken before reading, so a write during the read is picked up next poll
+        mtimes = self._file_mtimes()
+        bodies = []
+        for path in self.paths:
+            with open(path, 'rb') as f:
+                bodies.append(f.read())
+        digest = hashlib.sha256(b'\0'.join(bodies)).hexdigest()[:12]
+        value = self.build(*(loads(body) for body in bodies))
+        return Snapshot(self.name, version, digest, value, mtimes, datetime.now().isoformat())
+
+    def snapshot(self):
+        """
+        Current snapshot; the first call loads the files
+        """
+        current = self._snapshot
+        if current is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load(1)
+                current = self._snapshot
+        return current
+
+    def get(self):
+        return self.snapshot().value
+
+    def refresh(self):
+        """
+        Rebuild the snapshot if any file changed since it was loaded. True when swapped.
+        """
+        with self._lock:
+            current = self._snapshot
+            mtimes = None
+            try:
+                mtimes = self._file_mtimes()
+                if current is not None and mtimes in (current.mtimes, self._failed_mtimes):
+                    return False
+                self._snapshot = self._load(current.version + 1 if current else 1)
+            except (OSError, ValueError) as e:
+                if current is None:
+                    raise
+                # Reported once per broken version of the files
+                if mtimes is not None:
+                    self._failed_mtimes = mtimes
+                logger.warning("⚠️ %s reload failed, keeping v%d: %s", self.name, current.version, e)
+                return False
+
+        if current is not None:
+            logger.info("🔁 Reloaded %s v%d (%s)", self.name, self._snapshot.version, self._snapshot.digest)
+        return True
+
+
+_catalogs = {}
+_watch_thread = None
+
+
+def register(name, paths, build):
+    """
+    Declare a catalog; its files are read on first use
+    """
+    catalog = Catalog(name, paths, build)
+    _catalogs[name] = catalog
+    return catalog
+
+
+def get_catalog(name):
+    return _catalogs[name]
+
+
+def refresh_all():
+    for catalog in list(_catalogs.values()):
+        catalog.refresh()
+
+
+def catalog_versions():
+    """
+    name -> {version, digest, loadedAt} for every catalog loaded so far
+    """
+    versions = {}
+    for name, catalog in _catalogs.items():
+        snapshot = catalog._snapshot
+        if snapshot is not None:
+            versions[name] = {'version': snapshot.version, 'digest': snapshot.digest, 'loadedAt': snapshot.loaded_at}
+    return versions
+
+
+def _collect_catalog_metrics():
+    lines = ['# HELP janai_catalog_version Loaded catalog snapshot version (label: content digest)',
+             '# TYPE janai_catalog_version gauge']
+    for name, info in sorted(catalog_versions().items()):
+        lines.append(f'janai_catalog_version{{catalog="{name}",digest="{info["digest"]}"}} {info["version"]}')
+    return lines
+
+
+register_collector(_collect_catalog_metrics)
+
+
+def start_watcher(interval=None):
+    """
+    Start a daemon thread that reloads changed catalogs.
+    Interval defaults to CATALOG_WATCH_INTERVAL seconds (2); 0 disables reloading.
+    """
+    global _watch_thread
+
+    if interval is None:
+        interval = float(os.getenv('CATALOG_WATCH_INTERVAL', '2'))
+    if interval <= 0 or _watch_thread is not None:
+        return None
+
+    def watch_loop():
+        while True:
+            time.sleep(interval)
+            try:
+                refresh_all()
+            except Exception as e:
+                logger.exception("Catalog watcher error")
+
+    _watch_thread = threading.Thread(target=watch_loop, name='catalog-watcher', daemon=True)
+    _watch_thread.start()
+    return _watch_thread
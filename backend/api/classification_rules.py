@@ -0,0 +1,115 @@
+import itertools
+from types import MappingProxyType
+from .catalog import data_path, register
+from .keyword_matcher import KeywordAutomaton
+from .emergency_scorer import (
+    drop_contained_matches, keyword_containers, keyword_specificity_weights, rank_emergency_types
+)
+
+RULES_FILE = data_path('classification_rules.json')
+
+# Distinguishes compiled rule sets in caches keyed on them (see helpline_directory)
+_revisions = itertools.count(1)
+
+
+def flatten_keywords(keywords):
+    """
+    Keyword lists may be flat or grouped by language ({"English": [...], "Hindi": [...]})
+    """
+    if isinstance(keywords, dict):
+        return tuple(keyword for group in keywords.values() for keyword in group)
+    return tuple(keywords)
+
+
+def freeze(value):
+    """
+    Read-only copy of parsed JSON: dicts become mapping proxies, lists become tuples
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class CompiledRules:
+    """
+    Immutable lookup structures compiled from one version of the rules file
+    """
+
+    def __init__(self, rules):
+        self.version = rules.get('version', 0)
+        self.revision = next(_revisions)
+
+        emergency = rules.get('emergency', {})
+        self.language_codes = freeze(emergency.get('languageCodes', {}))
+        self.default_language = emergency.get('defaultLanguage', 'Hindi')
+        self.state_keywords = freeze(emergency.get('stateKeywords', {}))
+        self.state_order = tuple(self.state_keywords.keys())
+        self.type_priority = tuple(emergency.get('typePriority', []))
+        self.type_weights = freeze(emergency.get('typeWeights', {}))
+        self.context_rules = freeze(emergency.get('contextRules', []))
+        self.emergency_keywords = MappingProxyType({
+            category: flatten_keywords(keywords)
+            for category, keywords in emergency.get('keywords', {}).items()
+        })
+        self.priority_helplines = freeze(emergency.get('priorityHelplines', {}))
+        # Helplines that can represent a type when it is a secondary label, e.g. 101 for fire
+        general_helplines = self.priority_helplines.get('general', ())
+        self.lead_candidates = MappingProxyType({
+            emergency_type: tuple(
+                helpline for helpline in self.priority_helplines.get(emergency_type, general_helplines) + general_helplines
+                if helpline.get('type') == emergency_type
+            )
+            for emergency_type in self.type_priority
+        })
+        self.responses = freeze(emergency.get('responses', {}))
+
+        # Emergency categories plus one 'state:<name>' category per state
+        emergency_map = dict(self.emergency_keywords)
+        for state, keywords in self.state_keywords.items():
+            emergency_map[f'state:{state}'] = keywords
+        self.emergency_matcher = KeywordAutomaton(emergency_map)
+        self.emergency_weights = keyword_specificity_weights(
+            self.emergency_keywords, self.type_priority, self.type_weights
+        )
+        self.emergency_containers = keyword_containers(
+            self.emergency_matcher, self.emergency_keywords, self.type_priority
+        )
+
+        problem_analysis = rules.get('problemAnalysis', {})
+        self.problem_keywords = MappingProxyType({
+            category: flatten_keywords(keywords)
+            for category, keywords in problem_analysis.get('keywords', {}).items()
+        })
+        self.problem_matcher = KeywordAutomaton(self.problem_keywords)
+
+    def classify_emergency(self, text_lower):
+        """
+        One pass over the text: matched categories plus emergency types ranked by weighted score
+        """
+        matches = self.emergency_matcher.matches(text_lower)
+        matches = drop_contained_matches(matches, text_lower, self.emergency_containers)
+        ranked = rank_emergency_types(matches, self.emergency_weights, self.type_priority, self.context_rules)
+        return matches, ranked
+
+    def helplines_for(self, emergency_type):
+        """
+        Priority helpline list for an emergency type, as fresh dicts safe to return from a view
+        """
+        helplines = self.priority_helplines.get(emergency_type, self.priority_helplines.get('general', ()))
+        return [dict(helpline) for helpline in helplines]
+
+    def response_for(self, emergency_type, language):
+        responses = self.responses.get(emergency_type, self.responses.get('general', {}))
+        return responses.get(language, responses.get('English', ''))
+
+
+_catalog = register('classification_rules', [RULES_FILE], CompiledRules)
+
+
+def get_rules():
+    """
+    Current compiled rules (swapped by the catalog watcher when the file changes)
+    """
+    return _catalog.get()
@@ -0,0 +1,313 @@
+"""
+Offline complaint category classifier.
+
+Multinomial naive Bayes over hashed character n-grams, trained from the labeled
+descriptions in data/complaints.json. Train (or retrain) from the backend directory:
+
+    python -m api.complaint_classifier train [--data data/complaints.json] [--output data/complaint_classifier.npz]
+    python -m api.complaint_classifier evaluate
+
+Training also sets the confidence above which a prediction may replace a Gemini call:
+the lowest threshold at which at least CALIBRATION_MIN_SUPPORT held-out predictions
+(cross-validated on the same history) reach CALIBRATION_PRECISION. With too little history
+no threshold qualifies and every complaint still goes to Gemini.
+
+The trained model is loaded once at startup; without NumPy or a model file the
+classifier is simply disabled and callers fall back to Gemini.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from datetime import datetime
+from .catalog import data_path
+from .json_provider import read_json
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # classifier is optional
+    np = None
+
+COMPLAINTS_FILE = data_path('complaints.json')
+MODEL_FILE = data_path('complaint_classifier.npz')
+
+# Hashed feature space and character n-gram sizes
+N_FEATURES = 2 ** 14
+NGRAM_RANGE = (2, 4)
+
+# Laplace smoothing
+ALPHA = 0.1
+
+# History descriptions shorter than this (keyboard mashes like "asdfgh") are not trained on
+MIN_TRAINING_WORDS = 2
+
+# Held-out precision a confidence threshold must reach, over at least this many predictions
+CALIBRATION_PRECISION = 0.95
+CALIBRATION_MIN_SUPPORT = 20
+CALIBRATION_FOLDS = 10
+
+# Fixed threshold overriding the calibrated one (mainly for experiments)
+MIN_CONFIDENCE_OVERRIDE = os.getenv('COMPLAINT_CLASSIFIER_MIN_CONFIDENCE')
+
+_WHITESPACE = re.compile(r'\s+')
+
+_model = {'classifier': None, 'loaded': False}
+
+
+def normalize(text):
+    return ' ' + _WHITESPACE.sub(' ', (text or '').lower()).strip() + ' '
+
+
+def hash_ngrams(text, n_features=N_FEATURES, ngram_range=NGRAM_RANGE):
+    """
+    Sparse feature vector for text: (feature indices, counts) as NumPy arrays
+    """
+    text = normalize(text)
+    indices = []
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        for i in range(len(text) - n + 1):
+            # crc32 is stable across processes, unlike hash() on str
+            indices.append(zlib.crc32(text[i:i + n].encode('utf-8')) % n_features)
+    if not indices:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    unique, counts = np.unique(np.asarray(indices, dtype=np.int64), return_counts=True)
+    return unique, counts.astype(np.float32)
+
+
+class ComplaintClassifier:
+    """
+    Trained naive Bayes weights plus the hashing parameters they were trained with
+    """
+
+    def __init__(self, classes, class_log_prior, feature_log_prob, seen,
+                 n_features=N_FEATURES, ngram_range=NGRAM_RANGE, metadata=None):
+        self.classes = list(classes)
+        self.class_log_prior = class_log_prior
+        self.feature_log_prob = feature_log_prob
+        self.seen = seen
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.metadata = metadata or {}
+
+    @classmethod
+    def train(cls, texts, labels, n_features=N_FEATURES, ngram_range=NGRAM_RANGE, alpha=ALPHA):
+        classes = sorted(set(labels))
+        class_index = {label: i for i, label in enumerate(classes)}
+
+        feature_counts = np.zeros((len(classes), n_features), dtype=np.float64)
+        class_counts = np.zeros(len(classes), dtype=np.float64)
+
+        for text, label in zip(texts, labels):
+            row = class_index[label]
+            indices, counts = hash_ngrams(text, n_features, ngram_range)
+            np.add.at(feature_counts[row], indices, counts)
+            class_counts[row] += 1
+
+        seen = feature_counts.sum(axis=0) > 0
+        smoothed = feature_counts + alpha
+        feature_log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True)).astype(np.float32)
+        class_log_prior = np.log(class_counts / class_counts.sum()).astype(np.float32)
+
+        metadata = {
+            'samples': len(texts),
+            'alpha': alpha,
+            'trainedAt': datetime.now().isoformat()
+        }
+        return cls(classes, class_log_prior, feature_log_prob, seen, n_features, ngram_range, metadata)
+
+    def predict(self, text):
+        """
+        Most likely category with its confidence and the full posterior distribution.
+
+        Naive Bayes posteriors are overconfident on text unlike anything in the history,
+        so confidence is the posterior scaled by the share of n-grams seen in training.
+        """
+        indices, counts = hash_ngrams(text, self.n_features, self.ngram_range)
+        total = counts.sum()
+        coverage = float(counts[self.seen[indices]].sum() / total) if total else 0.0
+        scores = self.class_log_prior + self.feature_log_prob[:, indices] @ counts
+        scores = scores - scores.max()
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum()
+
+        best = int(probabilities.argmax())
+        return {
+            'category': self.classes[best],
+            'confidence': round(float(probabilities[best]) * coverage, 4),
+            'coverage': round(coverage, 4),
+            'probabilities': {label: round(float(p), 4) for label, p in zip(self.classes, probabilities)}
+        }
+
+    def save(self, path=MODEL_FILE):
+        np.savez_compressed(
+            path,
+            classes=np.array(self.classes),
+            class_log_prior=self.class_log_prior,
+            feature_log_prob=self.feature_log_prob,
+            seen=self.seen,
+            n_features=np.array(self.n_features),
+            ngram_range=np.array(self.ngram_range),
+            metadata=np.array(json.dumps(self.metadata))
+        )
+
+    @classmethod
+    def load(cls, path=MODEL_FILE):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                [str(label) for label in data['classes']],
+                data['class_log_prior'],
+                data['feature_log_prob'],
+                data['seen'],
+                int(data['n_features']),
+                tuple(int(n) for n in data['ngram_range']),
+                json.loads(str(data['metadata']))
+            )
+
+
+def load_training_data(path=COMPLAINTS_FILE):
+    complaints = read_json(path)
+    samples = [
+        (complaint['description'], complaint['category'])
+        for complaint in complaints
+        if complaint.get('category')
+        and len((complaint.get('description') or '').split()) >= MIN_TRAINING_WORDS
+    ]
+    return [text for text, _ in samples], [label for _, label in samples]
+
+
+def load_classifier(path=MODEL_FILE):
+    """
+    Load the trained model once at startup; returns None when unavailable
+    """
+    _model['loaded'] = True
+    if np is None:
+        logger.warning("⚠️ NumPy not installed, complaint classifier disabled")
+        return None
+    if not os.path.exists(path):
+        logger.warning("⚠️ No complaint classifier at %s, run: python -m api.complaint_classifier train", path)
+        return None
+    try:
+        _model['classifier'] = ComplaintClassifier.load(path)
+        logger.info("✅ Complaint classifier loaded (%d categories)", len(_model['classifier'].classes))
+    except Exception as e:
+        logger.warning("⚠️ Failed to load complaint classifier: %s", e)
+        _model['classifier'] = None
+    return _model['classifier']
+
+
+def predict_category(text):
+    """
+    Category suggestion for a complaint description, or None if no classifier is available
+    """
+    if not _model['loaded']:
+        load_classifier()
+    classifier = _model['classifier']
+    if classifier is None or not (text or '').strip():
+        return None
+    return classifier.predict(text)
+
+
+def is_confident(suggestion):
+    """
+    True when a prediction is confident enough to stand in for Gemini
+    """
+    if MIN_CONFIDENCE_OVERRIDE:
+        threshold = float(MIN_CONFIDENCE_OVERRIDE)
+    else:
+        classifier = _model['classifier']
+        threshold = classifier.metadata.get('minConfidence') if classifier is not None else None
+    return threshold is not None and suggestion['confidence'] >= threshold
+
+
+def held_out_predictions(texts, labels, folds=CALIBRATION_FOLDS):
+    """
+    (true label, predicted category, confidence) for every sample, each predicted by a model
+    trained without its fold (leave-one-out when there are fewer samples than folds)
+    """
+    folds = min(folds, len(texts))
+    results = []
+    for fold in range(folds):
+        train = [i for i in range(len(texts)) if i % folds != fold]
+        classifier = ComplaintClassifier.train([texts[i] for i in train], [labels[i] for i in train])
+        for i in range(fold, len(texts), folds):
+            prediction = classifier.predict(texts[i])
+            results.append((labels[i], prediction['category'], prediction['confidence']))
+    return results
+
+
+def calibrate_min_confidence(predictions, precision=CALIBRATION_PRECISION, min_support=CALIBRATION_MIN_SUPPORT):
+    """
+    Lowest confidence at which the held-out predictions at or above it reach the target
+    precision with enough support, or None when no threshold does
+    """
+    best = None
+    correct = 0
+    ranked = sorted(predictions, key=lambda item: item[2], reverse=True)
+    for count, (label, predicted, confidence) in enumerate(ranked, 1):
+        correct += label == predicted
+        # Only cut between distinct confidences
+        if count < len(ranked) and ranked[count][2] == confidence:
+            continue
+        if count >= min_support and correct / count >= precision:
+            best = confidence
+    return best
+
+
+def evaluate(texts, labels):
+    """
+    Cross-validated accuracy, per-class recall and calibrated confidence threshold on the history
+    """
+    predictions = held_out_predictions(texts, labels)
+    per_class = {}
+    for label, predicted, _ in predictions:
+        stats = per_class.setdefault(label, {'total': 0, 'correct': 0})
+        stats['total'] += 1
+        stats['correct'] += predicted == label
+    correct = sum(stats['correct'] for stats in per_class.values())
+    accuracy = correct / len(predictions) if predictions else 0.0
+    return accuracy, per_class, calibrate_min_confidence(predictions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train or evaluate the complaint category classifier')
+    parser.add_argument('command', choices=['train', 'evaluate'])
+    parser.add_argument('--data', default=COMPLAINTS_FILE)
+    parser.add_argument('--output', default=MODEL_FILE)
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit('NumPy is required: pip install numpy')
+
+    texts, labels = load_training_data(args.data)
+    print(f"Loaded {len(texts)} labeled complaints across {len(set(labels))} categories")
+
+    accuracy, per_class, min_confidence = evaluate(texts, labels)
+    print(f"Cross-validated accuracy: {accuracy:.3f}")
+    for label, stats in sorted(per_class.items()):
+        print(f"  {label:<16} recall {stats['correct']}/{stats['total']}")
+    if min_confidence is None:
+        print(f"No confidence threshold reaches {CALIBRATION_PRECISION:.0%} held-out precision over "
+              f"{CALIBRATION_MIN_SUPPORT}+ predictions; Gemini stays in use for every complaint")
+    else:
+        print(f"Minimum confidence to skip Gemini: {min_confidence:.4f}")
+    if args.command == 'evaluate':
+        return
+
+    classifier = ComplaintClassifier.train(texts, labels)
+    classifier.metadata.update({'accuracy': round(accuracy, 4), 'minConfidence': min_confidence})
+    classifier.save(args.output)
+
+    start = time.perf_counter()
+    for text in texts:
+        classifier.predict(text)
+    per_prediction_ms = (time.perf_counter() - start) * 1000 / max(len(texts), 1)
+    print(f"Saved {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB), {per_prediction_ms:.3f} ms per prediction")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,36 @@
 from flask import Blueprint, request, jsonify
-import json
+import logging
 import random
 import string
 from datetime import datetime
+from .catalog import data_path
+from .json_provider import read_json, write_json
 from .email_service import send_complaint_email, send_confirmation_email, generate_complaint_draft_with_gemini
+from .idempotency import IdempotencyStore, idempotent
+
+logger = logging.getLogger(__name__)
 
 complaint_bp = Blueprint('complaint', __name__)
 
+COMPLAINTS_FILE = data_path('complaints.json')
+
+# Responses to recent filings, replayed when a client retries with the same Idempotency-Key
+filing_requests = IdempotencyStore()
+
 def load_complaints():
-    try:
-        with open('data/complaints.json', 'r') as f:
-            data = json.load(f)
-            if not isinstance(data, list):
-                return []
-            return data
-    except (json.JSONDecodeError, FileNotFoundError):
+    data = read_json(COMPLAINTS_FILE, default=[])
+    if not isinstance(data, list):
         return []
+    return data
 
 def save_complaints(complaints):
-    with open('data/complaints.json', 'w') as f:
-        json.dump(complaints, f, indent=2)
+    write_json(COMPLAINTS_FILE, complaints)
 
 def generate_tracking_id():
     return f"JANAI-{''.join(random.choices(string.digits, k=5))}"
 
 @complaint_bp.route('/file', methods=['POST'])
+@idempotent(filing_requests)
 def file_complaint():
     data = request.get_json()
     
@@ -41,9 +47,10 @@ def file_complaint():
     
     # Check if there's an edited authority email from the draft
     edited_authority_email = data.get('editedAuthorityEmail')
-    print(f"DEBUG: Received editedAuthorityEmail: {edited_authority_email}")
-    print(f"DEBUG: Category: {data.get('category')}")
-    print(f"DEBUG: Auto-generated email would be: {data.get('category', '').lower().replace(' ', '.')}@examplecity.gov.in")
+    logger.debug("Authority email for new complaint", extra={
+        'category': data.get('category'),
+        'editedAuthorityEmail': edited_authority_email
+    })
     
     # Create new complaint
     new_complaint = {
@@ -0,0 +1,212 @@
+"""
+Response compression for API payloads (complaint history with AI drafts, scheme lists).
+
+JSON and text responses of at least COMPRESSION_MIN_BYTES are compressed with brotli or
+gzip, whichever the client prefers in Accept-Encoding (brotli needs the Brotli package).
+Streamed responses are compressed chunk by chunk as they are sent; buffered bodies are
+compressed in one shot and keep their Content-Length. Per-route size, ratio and CPU time are recorded so the
+thresholds can be tuned (GET /api/compression-stats). Responses a route already encoded
+(the prebuilt helpline variants) are passed through untouched.
+"""
+import gzip
+import os
+import threading
+import time
+import zlib
+from flask import request
+from .gemini_metrics import Histogram
+
+try:
+    import brotli
+except ImportError:  # br is optional, gzip is always available
+    brotli = None
+
+MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))
+
+# Dynamic responses favour speed over the last few percent of ratio
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/plain', 'text/csv', 'text/html')
+
+# Client preference order on equal q-values
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+SIZE_BUCKETS_BYTES = (1024, 4096, 16384, 65536, 262144, 1048576)
+CPU_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25)
+
+
+class RouteStats:
+    """
+    Compression accounting for one route
+    """
+
+    def __init__(self):
+        self.responses = 0
+        self.compressed = 0
+        self.streamed = 0
+        self.skipped = {'tooSmall': 0, 'notAccepted': 0, 'preEncoded': 0}
+        self.encodings = {encoding: 0 for encoding in ENCODINGS}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.size_bytes = Histogram(SIZE_BUCKETS_BYTES)
+        self.cpu_ms = Histogram(CPU_BUCKETS_MS)
+
+    def snapshot(self):
+        return {
+            'responses': self.responses,
+            'compressed': self.compressed,
+            'streamed': self.streamed,
+            'skipped': dict(self.skipped),
+            'encodings': dict(self.encodings),
+            'bytesIn': self.bytes_in,
+            'bytesOut': self.bytes_out,
+            'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            'cpuMsPerKb': round(self.cpu_ms.total / (self.bytes_in / 1024), 4) if self.bytes_in else None,
+            'sizeBytes': self.size_bytes.snapshot(),
+            'cpuMs': self.cpu_ms.snapshot()
+        }
+
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def _route_stats(route):
+    stats = _stats.get(route)
+    if stats is None:
+        stats = _stats.setdefault(route, RouteStats())
+    return stats
+
+
+def record_skip(route, reason, size):
+    with _lock:
+        stats = _route_stats(route)
+        stats.responses += 1
+        stats.skipped[reason] += 1
+        stats.size_bytes.observe(size)
+
+
+def record_compression(route, encoding, bytes_in, bytes_out, cpu_ms, streamed=False):
+    with _lock:
+        stats = _route_stats(route)
+        stats.responses += 1
+        stats.compressed += 1
+        stats.streamed += 1 if streamed else 0
+        stats.encodings[encoding] += 1
+        stats.bytes_in += bytes_in
+        stats.bytes_out += bytes_out
+        stats.size_bytes.observe(bytes_in)
+        stats.cpu_ms.observe(cpu_ms)
+
+
+def get_compression_stats():
+    with _lock:
+        return {
+            'minBytes': MIN_BYTES,
+            'encodings': list(ENCODINGS),
+            'routes': {route: stats.snapshot() for route, stats in sorted(_stats.items())}
+        }
+
+
+def choose_encoding(accept_encodings):
+    best = None
+    best_quality = 0
+    for encoding in ENCODINGS:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _compressor(encoding):
+    """
+    (compress chunk, flush) callables for incremental compression
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def compress_stream(chunks, encoding, route):
+    """
+    Compress an iterable of body chunks as it is consumed, recording stats at the end
+    """
+    process, finish = _compressor(encoding)
+    bytes_in = 0
+    bytes_out = 0
+    cpu = 0.0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        bytes_in += len(chunk)
+        start = time.thread_time()
+        data = process(chunk)
+        cpu += time.thread_time() - start
+        if data:
+            bytes_out += len(data)
+            yield data
+    start = time.thread_time()
+    data = finish()
+    cpu += time.thread_time() - start
+    bytes_out += len(data)
+    yield data
+    record_compression(route, encoding, bytes_in, bytes_out, cpu * 1000, streamed=True)
+
+
+def compress_response(response):
+    """
+    after_request hook: compress eligible API responses for clients that accept it
+    """
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or response.mimetype not in COMPRESSIBLE_TYPES
+            or not request.path.startswith('/api')):
+        return response
+
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if 'Content-Encoding' in response.headers:
+        # Already encoded by the route (prebuilt variants)
+        record_skip(route, 'preEncoded', 0 if response.is_streamed else response.content_length or 0)
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+
+    if response.is_streamed:
+        if encoding is None:
+            record_skip(route, 'notAccepted', 0)
+            return response
+        response.response = compress_stream(response.response, encoding, route)
+    else:
+        body = response.get_data()
+        if len(body) < MIN_BYTES:
+            record_skip(route, 'tooSmall', len(body))
+            return response
+        if encoding is None:
+            record_skip(route, 'notAccepted', len(body))
+            return response
+        start = time.thread_time()
+        compressed = compress_body(body, encoding)
+        record_compression(route, encoding, len(body), len(compressed), (time.thread_time() - start) * 1000)
+        response.set_data(compressed)
+
+    response.headers['Content-Encoding'] = encoding
+    if response.is_streamed:
+        response.headers.pop('Content-Length', None)
+    # The compressed bytes differ from the identity ones; a weak ETag still revalidates
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
@@ -1,8 +1,16 @@
-import json
+import logging
 import random
+import time
 from datetime import datetime
-from flask_mail import Mail, Message
 from flask import current_app
+from .gemini_metrics import track_gemini_call, failure_outcome
+from .catalog import data_path
+from .json_provider import read_json, write_json
+from .metrics import observe_smtp_send
+
+logger = logging.getLogger(__name__)
+
+EMAIL_LOG_FILE = data_path('email_logs.json')
 
 def init_mail(app):
     """
@@ -15,9 +23,43 @@ def init_mail(app):
     app.config['MAIL_PASSWORD'] = 'allyugertivulksr'
     app.config['MAIL_DEFAULT_SENDER'] = ('Complaint System', 'deepanshichoudhary03@gmail.com')
 
-    app.mail = Mail(app)
-    print("✅ Flask-Mail initialized successfully")
-    print(f"📧 Email configured for: {app.config['MAIL_USERNAME']}")
+    # Flask-Mail (and the email/smtplib stack it pulls in) is imported on the first send
+    logger.info("✅ Flask-Mail configured")
+    logger.info("📧 Email configured for: %s", app.config['MAIL_USERNAME'])
+
+
+def get_mail(app):
+    """
+    The app's Flask-Mail state, created on first use
+    """
+    mail = app.extensions.get('mail')
+    if mail is None:
+        from flask_mail import Mail
+        Mail(app)
+        mail = app.extensions['mail']
+    return mail
+
+
+def new_message(**fields):
+    """
+    flask_mail.Message; the sender defaults to the app's Flask-Mail state, so that is set up first
+    """
+    get_mail(current_app)
+    from flask_mail import Message
+    return Message(**fields)
+
+
+def send_mail(msg, kind):
+    """
+    Send through Flask-Mail, recording the SMTP round trip by email kind and outcome
+    """
+    start = time.perf_counter()
+    try:
+        get_mail(current_app).send(msg)
+    except Exception:
+        observe_smtp_send(kind, 'error', time.perf_counter() - start)
+        raise
+    observe_smtp_send(kind, 'sent', time.perf_counter() - start)
 
 
 def send_complaint_email(complaint_data, authority_email):
@@ -58,13 +100,13 @@ def send_complaint_email(complaint_data, authority_email):
                 email_body += f"\n\n{cleaned_draft}"
         
         # Prepare email
-        msg = Message(
+        msg = new_message(
             subject=f"New Complaint: {complaint_data.get('category')}",
             recipients=[authority_email],
             body=email_body
         )
 
-        current_app.mail.send(msg)
+        send_mail(msg, 'complaint_notification')
 
         # Save to email logs
         email_log = {
@@ -97,7 +139,7 @@ def send_confirmation_email(user_email, complaint_data):
     """
     try:
         # Prepare email
-        msg = Message(
+        msg = new_message(
             subject=f"Complaint Confirmation: {complaint_data.get('id')}",
             recipients=[user_email],
             body=f"Your complaint has been received successfully.\n\n"
@@ -107,7 +149,7 @@ def send_confirmation_email(user_email, complaint_data):
                  f"Our team will process your complaint shortly."
         )
 
-        current_app.mail.send(msg)
+        send_mail(msg, 'confirmation')
 
         # Save to email logs
         email_log = {
@@ -138,22 +180,16 @@ def save_email_log(email_log):
     """
     Save email log to JSON file
     """
-    try:
-        with open('data/email_logs.json', 'r') as f:
-            logs = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        logs = []
-    
+    logs = read_json(EMAIL_LOG_FILE, default=[])
     logs.append(email_log)
-    
-    with open('data/email_logs.json', 'w') as f:
-        json.dump(logs, f, indent=2)
+    write_json(EMAIL_LOG_FILE, logs)
 
 
 def generate_feedback_email_with_gemini(feedback_data):
     """
     Generate feedback email content using Gemini AI
     """
+    call = track_gemini_call('feedback_email')
     try:
         import google.generativeai as genai
         import os
@@ -190,13 +226,17 @@ Make it professional, well-structured, and engaging. The email should be for int
         """
         
         # Generate response from Gemini
+        call.begin(prompt)
         response = model.generate_content(prompt)
         email_content = response.text
+        call.response_received(email_content, response)
+        call.finish('ok')
         
         return email_content
         
     except Exception as e:
-        print(f"Gemini AI Error: {e}")
+        logger.warning("Gemini feedback email generation failed: %s", e)
+        call.finish(failure_outcome(e, default='error'))
         # Return error message instead of fallback template
         return f"Error generating AI content: {str(e)}"
 
@@ -204,6 +244,7 @@ def generate_complaint_draft_with_gemini(complaint_data):
     """
     Generate complaint draft content using Gemini AI
     """
+    call = track_gemini_call('complaint_draft')
     try:
         import google.generativeai as genai
         import os
@@ -258,20 +299,25 @@ Make it professional, well-structured, and suitable for official communication w
         """
         
         # Generate response from Gemini with timeout
+        call.begin(prompt)
         response = model.generate_content(prompt)
         draft_content = response.text
+        call.response_received(draft_content, response)
+        call.finish('ok')
         
         return draft_content
         
     except Exception as e:
-        print(f"Gemini AI Error for complaint draft: {e}")
+        logger.warning("Gemini complaint draft generation failed: %s", e)
         
         # Check if it's a network/proxy error
         if "DNS resolution failed" in str(e) or "proxy" in str(e).lower() or "timeout" in str(e).lower():
-            print("Network/proxy issue detected. Using fallback template.")
+            logger.info("Network/proxy issue detected, using the fallback draft template")
+            call.finish(failure_outcome(e))
             return generate_fallback_complaint_draft(complaint_data)
         
         # Return error message for other issues
+        call.finish('error')
         return f"Error generating complaint draft: {str(e)}"
 
 def generate_fallback_complaint_draft(complaint_data):
@@ -412,13 +458,13 @@ def send_feedback_email(feedback_data):
             }
         
         # Prepare email
-        msg = Message(
+        msg = new_message(
             subject="🚀 New User Feedback - JANAI Civic Platform",
             recipients=['deepanshichoudhary03@gmail.com'],  # JANAI email
             body=email_body
         )
 
-        current_app.mail.send(msg)
+        send_mail(msg, 'feedback')
 
         # Save to email logs
         email_log = {
@@ -0,0 +1,119 @@
+import math
+from .language_detector import LATIN, keyword_script
+
+# Confidence of a label saturates with its score: 1 - 0.5 ** score, capped
+MAX_CONFIDENCE = 0.95
+
+# Latin-script keywords this short are discounted as likely substring false positives.
+# Indic keywords are not: a code point count says little about an aksara ("आग" is two
+# code points, "தீ" one), and short words like these are the core emergency terms.
+SHORT_KEYWORD_LENGTH = 2
+
+# Secondary labels below this confidence are not surfaced
+MIN_SECONDARY_CONFIDENCE = 0.5
+
+
+def keyword_specificity_weights(keyword_map, emergency_types, type_weights=None):
+    """
+    Weight every (category, keyword) pair by how specific the keyword is.
+
+    Multi-word phrases ("domestic violence", "missing child") weigh more than single
+    words, very short Latin-script keywords weigh less because they also match inside
+    longer words ("ac" inside "accident"), and a keyword shared by several emergency types (e.g. "लड़की"
+    for both women and child) is split between them. Optional per-type weights scale the result.
+    """
+    type_weights = type_weights or {}
+    type_set = set(emergency_types)
+
+    sharing = {}
+    for category, keywords in keyword_map.items():
+        if category not in type_set:
+            continue
+        for keyword in set(keywords):
+            sharing[keyword] = sharing.get(keyword, 0) + 1
+
+    weights = {}
+    for category, keywords in keyword_map.items():
+        if category not in type_set:
+            continue
+        type_weight = type_weights.get(category, 1.0)
+        for keyword in keywords:
+            words = len(keyword.split())
+            specificity = (1.0 + 0.5 * (words - 1)) / sharing[keyword]
+            if len(keyword) <= SHORT_KEYWORD_LENGTH and keyword_script(keyword) == LATIN:
+                specificity *= 0.5
+            weights[(category, keyword)] = round(specificity * type_weight, 4)
+    return weights
+
+
+def keyword_containers(automaton, keyword_map, emergency_types):
+    """
+    Map (category, keyword) to the longer keywords of other emergency types that contain it,
+    e.g. water's "जल" -> ("बिजली",) from electricity. Found by running each keyword through
+    the automaton built over the same keyword map.
+    """
+    type_set = set(emergency_types)
+    containers = {}
+    for category, keywords in keyword_map.items():
+        if category not in type_set:
+            continue
+        for keyword in keywords:
+            for inner_category, inner_keywords in automaton.matches(keyword).items():
+                if inner_category == category or inner_category not in type_set:
+                    continue
+                for inner in inner_keywords:
+                    if inner != keyword:
+                        containers.setdefault((inner_category, inner), set()).add(keyword)
+    return {key: tuple(sorted(found)) for key, found in containers.items()}
+
+
+def drop_contained_matches(matches, text, containers):
+    """
+    Drop keyword matches that only occur inside a matched longer keyword of another type,
+    so "बिजली" (electricity) does not also count as "जल" (water)
+    """
+    matched = set().union(*matches.values()) if matches else set()
+    kept = {}
+    for category, keywords in matches.items():
+        remaining = set()
+        for keyword in keywords:
+            found = [container for container in containers.get((category, keyword), ()) if container in matched]
+            if found and text.count(keyword) <= sum(text.count(c) * c.count(keyword) for c in found):
+                continue
+            remaining.add(keyword)
+        if remaining:
+            kept[category] = remaining
+    return kept
+
+
+def label_confidence(score):
+    return round(min(MAX_CONFIDENCE, 1.0 - math.pow(0.5, score)), 3) if score > 0 else 0.0
+
+
+def rank_emergency_types(matches, weights, type_priority, context_rules=()):
+    """
+    Rank emergency types from one pass of keyword matches ({category: {keywords}}).
+
+    Returns [{'type', 'score', 'confidence'}] best first; ties keep the type priority order.
+    Context rules add a bonus to a type when all `requires` categories matched and none of
+    the `excludes` categories did.
+    """
+    scores = {}
+    for emergency_type in type_priority:
+        keywords = matches.get(emergency_type)
+        if keywords:
+            scores[emergency_type] = sum(weights.get((emergency_type, keyword), 1.0) for keyword in keywords)
+
+    for rule in context_rules:
+        if all(category in matches for category in rule.get('requires', ())) and \
+                not any(category in matches for category in rule.get('excludes', ())):
+            emergency_type = rule['type']
+            scores[emergency_type] = scores.get(emergency_type, 0.0) + rule.get('bonus', 1.0)
+
+    order = {emergency_type: position for position, emergency_type in enumerate(type_priority)}
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], order.get(item[0], len(order))))
+
+    return [
+        {'type': emergency_type, 'score': round(score, 3), 'confidence': label_confidence(score)}
+        for emergency_type, score in ranked
+    ]
@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from .catalog import data_path
+from .metrics import observe_gemini_call
+
+logger = logging.getLogger(__name__)
+
+# Prompt types sent to Gemini across the blueprints
+PROMPT_TYPES = (
+    'problem_analysis',
+    'scheme_recommendation',
+    'complaint_draft',
+    'feedback_email',
+    'voice_to_text',
+    'voice_analysis',
+    'emergency'
+)
+
+# ok: parsed Gemini answer, timeout: call too slow, parse_failure: answer not usable JSON,
+# fallback: keyword/template answer served instead of Gemini, error: request failed outright
+OUTCOMES = ('ok', 'timeout', 'parse_failure', 'fallback', 'error')
+
+# Fixed histogram bucket upper bounds, so memory stays bounded however many calls we record
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+SIZE_BUCKETS_CHARS = (256, 1024, 4096, 16384, 65536)
+
+# Gemini does not always report usage, so tokens are estimated from characters
+CHARS_PER_TOKEN = 4
+
+# gemini-pro is billed per 1k characters (USD), override via environment when pricing changes
+INPUT_COST_PER_1K_CHARS = float(os.getenv('GEMINI_INPUT_COST_PER_1K_CHARS', '0.000125'))
+OUTPUT_COST_PER_1K_CHARS = float(os.getenv('GEMINI_OUTPUT_COST_PER_1K_CHARS', '0.000375'))
+
+DEFAULT_DUMP_PATH = data_path('gemini_metrics.ndjson')
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with count, sum, min and max
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def snapshot(self):
+        buckets = {f'le_{bound}': count for bound, count in zip(self.bounds, self.counts)}
+        buckets['le_inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'sum': round(self.total, 3),
+            'avg': round(self.total / self.count, 3) if self.count else 0,
+            'min': self.min,
+            'max': self.max,
+            'buckets': buckets
+        }
+
+
+class PromptStats:
+    """
+    Aggregated accounting for one prompt type
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+        self.prompt_chars = Histogram(SIZE_BUCKETS_CHARS)
+        self.response_chars = Histogram(SIZE_BUCKETS_CHARS)
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.estimated_cost_usd = 0.0
+
+    def snapshot(self):
+        return {
+            'calls': self.calls,
+            'outcomes': dict(self.outcomes),
+            'promptTokens': self.prompt_tokens,
+            'responseTokens': self.response_tokens,
+            'estimatedCostUsd': round(self.estimated_cost_usd, 6),
+            'promptChars': self.prompt_chars.snapshot(),
+            'responseChars': self.response_chars.snapshot(),
+            'latencyMs': self.latency_ms.snapshot()
+        }
+
+
+_lock = threading.Lock()
+_stats = {prompt_type: PromptStats() for prompt_type in PROMPT_TYPES}
+_started_at = datetime.now().isoformat()
+
+
+def record_gemini_call(prompt_type, prompt_chars, response_chars, elapsed_ms, outcome,
+                       prompt_tokens=None, response_tokens=None):
+    """
+    Record a single Gemini call (or the fallback served instead of one)
+    """
+    if outcome not in OUTCOMES:
+        outcome = 'error'
+    if prompt_tokens is None:
+        prompt_tokens = (prompt_chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    if response_tokens is None:
+        response_tokens = (response_chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+    with _lock:
+        stats = _stats.get(prompt_type)
+        if stats is None:
+            stats = _stats[prompt_type] = PromptStats()
+        stats.calls += 1
+        stats.outcomes[outcome] += 1
+        stats.prompt_tokens += prompt_tokens
+        stats.response_tokens += response_tokens
+        # Fallbacks served without a request don't cost anything
+        if prompt_chars:
+            stats.estimated_cost_usd += (prompt_chars / 1000.0) * INPUT_COST_PER_1K_CHARS
+            stats.estimated_cost_usd += (response_chars / 1000.0) * OUTPUT_COST_PER_1K_CHARS
+        if prompt_chars:
+            stats.prompt_chars.observe(prompt_chars)
+            stats.response_chars.observe(response_chars)
+        if elapsed_ms is not None:
+            stats.latency_ms.observe(elapsed_ms)
+    observe_gemini_call(prompt_type, outcome, elapsed_ms)
+
+
+class GeminiCall:
+    """
+    Tracks one Gemini round trip from prompt to final outcome.
+
+    Usage:
+        call = track_gemini_call('problem_analysis')
+        call.begin(prompt)
+        response = model.generate_content(prompt)
+        call.response_received(response.text, response)
+        ...
+        call.finish('ok')
+    """
+
+    def __init__(self, prompt_type):
+        self.prompt_type = prompt_type
+        self.prompt = ''
+        self.response_text = ''
+        self.usage = None
+        self.started = None
+        self.elapsed_ms = None
+        self.finished = False
+
+    def begin(self, prompt):
+        self.prompt = prompt or ''
+        self.started = time.perf_counter()
+
+    def response_received(self, response_text, response=None):
+        if self.started is not None:
+            self.elapsed_ms = (time.perf_counter() - self.started) * 1000
+        self.response_text = response_text or ''
+        self.usage = getattr(response, 'usage_metadata', None) if response is not None else None
+
+    def finish(self, outcome):
+        """
+        Record the call; only the first outcome counts
+        """
+        if self.finished:
+            return
+        self.finished = True
+
+        if self.elapsed_ms is None and self.started is not None:
+            self.elapsed_ms = (time.perf_counter() - self.started) * 1000
+
+        prompt_tokens = getattr(self.usage, 'prompt_token_count', None) if self.usage else None
+        response_tokens = getattr(self.usage, 'candidates_token_count', None) if self.usage else None
+
+        record_gemini_call(
+            self.prompt_type,
+            len(self.prompt),
+            len(self.response_text),
+            self.elapsed_ms,
+            outcome,
+            prompt_tokens=prompt_tokens,
+            response_tokens=response_tokens
+        )
+
+
+def failure_outcome(error, default='fallback'):
+    """
+    Classify an exception raised around a Gemini call
+    """
+    message = str(error).lower()
+    if 'timeout' in message or 'timed out' in message or 'deadline' in message:
+        return 'timeout'
+    return default
+
+
+def track_gemini_call(prompt_type):
+    return GeminiCall(prompt_type)
+
+
+def get_gemini_stats():
+    """
+    Snapshot of all prompt type statistics
+    """
+    with _lock:
+        prompt_types = {name: stats.snapshot() for name, stats in _stats.items()}
+
+    totals = {
+        'calls': sum(s['calls'] for s in prompt_types.values()),
+        'promptTokens': sum(s['promptTokens'] for s in prompt_types.values()),
+        'responseTokens': sum(s['responseTokens'] for s in prompt_types.values()),
+        'estimatedCostUsd': round(sum(s['estimatedCostUsd'] for s in prompt_types.values()), 6)
+    }
+
+    return {
+        'since': _started_at,
+        'timestamp': datetime.now().isoformat(),
+        'totals': totals,
+        'promptTypes': prompt_types
+    }
+
+
+def dump_gemini_stats(path=None):
+    """
+    Append the current snapshot to an NDJSON file, one line per prompt type
+    """
+    path = path or os.getenv('GEMINI_METRICS_DUMP_PATH', DEFAULT_DUMP_PATH)
+    snapshot = get_gemini_stats()
+
+    lines = []
+    for prompt_type, stats in snapshot['promptTypes'].items():
+        record = {'timestamp': snapshot['timestamp'], 'pid': os.getpid(), 'promptType': prompt_type}
+        record.update(stats)
+        lines.append(json.dumps(record, ensure_ascii=False))
+    if not lines:
+        return
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+_dump_thread = None
+
+
+def start_metrics_dump(interval=None, path=None):
+    """
+    Start a daemon thread that periodically dumps Gemini stats as NDJSON.
+    Interval defaults to GEMINI_METRICS_DUMP_INTERVAL seconds (300); 0 disables dumping.
+    """
+    global _dump_thread
+
+    if interval is None:
+        interval = float(os.getenv('GEMINI_METRICS_DUMP_INTERVAL', '300'))
+    if interval <= 0 or _dump_thread is not None:
+        return None
+
+    def dump_loop():
+        while True:
+            time.sleep(interval)
+            try:
+                dump_gemini_stats(path)
+            except Exception as e:
+                logger.warning("Gemini metrics dump failed: %s", e)
+
+    _dump_thread = threading.Thread(target=dump_loop, name='gemini-metrics-dump', daemon=True)
+    _dump_thread.start()
+    return _dump_thread
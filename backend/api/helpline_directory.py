@@ -0,0 +1,179 @@
+import logging
+from .catalog import data_path, register
+
+logger = logging.getLogger(__name__)
+
+# Public helpline catalog (Central/State entries served by /api/helpline)
+HELPLINE_FILE = data_path('helpline.json')
+# State emergency helplines, recommendation lines and localized helpline lines
+DIRECTORY_FILE = data_path('helpline_directory.json')
+
+
+def dedupe_by_number(helplines):
+    """
+    Drop later entries whose number was already listed
+    """
+    seen = set()
+    unique = []
+    for helpline in helplines:
+        if helpline['number'] not in seen:
+            seen.add(helpline['number'])
+            unique.append(helpline)
+    return unique
+
+
+class HelplineDirectory:
+    """
+    Every helpline source merged into lookup tables keyed by state, emergency type and language.
+    Built once per version of the data files; entries are deduplicated here, not per request.
+    """
+
+    def __init__(self, catalog, directory):
+        self.version = directory.get('version', 0)
+
+        # Catalog: central helplines plus each state's own, in file order
+        helplines = catalog.get('helplines', [])
+        self.central = tuple(helpline for helpline in helplines if helpline.get('level') == 'Central')
+        catalog_states = []
+        for helpline in helplines:
+            if helpline.get('level') == 'State' and helpline.get('state') not in catalog_states:
+                catalog_states.append(helpline.get('state'))
+        self.catalog_by_state = {
+            state: tuple(
+                helpline for helpline in helplines
+                if helpline.get('level') == 'Central'
+                or (helpline.get('level') == 'State' and helpline.get('state') == state)
+            )
+            for state in catalog_states
+        }
+
+        # State emergency helplines, deduplicated by number
+        self.state_helplines = {
+            state: tuple(dedupe_by_number(entries))
+            for state, entries in directory.get('stateHelplines', {}).items()
+        }
+
+        # "Call 108 for ambulance (...)" lines appended to analysis recommendations
+        recommended = directory.get('recommendedNumbers', {})
+        self.default_recommended = tuple(recommended.get('default', []))
+        self.recommended_by_state = {
+            state.lower(): tuple(lines) for state, lines in recommended.get('states', {}).items()
+        }
+
+        # Native-language helpline lines, by (language, state) with a per-language 'general' entry
+        self.localized = {
+            (language.lower(), state.lower()): tuple(lines)
+            for language, states in directory.get('localizedHelplines', {}).items()
+            for state, lines in states.items()
+        }
+
+        # (rules revision, state, emergency type) -> merged emergency helpline lists, filled on first use
+        self._emergency_lists = {}
+        # rules revision -> national (name, number) list, filled on first use
+        self._national = {}
+
+    def catalog_for_state(self, state):
+        """
+        Central plus state catalog entries (central only for states without their own)
+        """
+        return self.catalog_by_state.get(state, self.central)
+
+    def helplines_for_state(self, state):
+        """
+        State emergency helplines (empty for states without their own)
+        """
+        return [dict(helpline) for helpline in self.state_helplines.get(state, ())]
+
+    def recommended_numbers(self, state):
+        return list(self.recommended_by_state.get(state.lower(), self.default_recommended))
+
+    def national_helplines(self, rules):
+        """
+        (name, number) for the national emergency helplines followed by the central catalog,
+        one entry per number
+        """
+        national = self._national.get(rules.revision)
+        if national is None:
+            entries = [
+                {'number': helpline['number'], 'name': helpline['name']}
+                for helpline in rules.priority_helplines.get('general', ())
+            ] + [
+                {'number': helpline['number'], 'name': helpline['service']}
+                for helpline in self.central
+            ]
+            national = tuple((entry['name'], entry['number']) for entry in dedupe_by_number(entries))
+            self._national = {rules.revision: national}
+        return list(national)
+
+    def localized_helplines(self, language, state):
+        language = language.lower()
+        lines = self.localized.get((language, state.lower()), self.localized.get((language, 'general'), ()))
+        return list(lines)
+
+    def _merged_emergency_list(self, rules, state, emergency_type):
+        """
+        National priority helplines for the type merged with the state's helplines, deduplicated,
+        split into (type matches, other national, other state) so secondary leads can slot in between
+        """
+        key = (rules.revision, state, emergency_type)
+        merged = self._emergency_lists.get(key)
+        if merged is not None:
+            return merged
+
+        national = list(rules.priority_helplines.get(emergency_type, rules.priority_helplines.get('general', ())))
+        national_numbers = {helpline['number'] for helpline in national}
+        local = [
+            helpline for helpline in self.state_helplines.get(state, ())
+            if helpline['number'] not in national_numbers
+        ]
+
+        if emergency_type == 'general':
+            head, national_rest, local_rest = [], national, local
+        else:
+            head = [h for h in national if h.get('type') == emergency_type] + \
+                [h for h in local if h.get('type') == emergency_type]
+            national_rest = [h for h in national if h.get('type') != emergency_type]
+            local_rest = [h for h in local if h.get('type') != emergency_type]
+
+        numbers = frozenset(helpline['number'] for helpline in national + local)
+        merged = (tuple(head), tuple(national_rest), tuple(local_rest), numbers)
+        if len(self._emergency_lists) > 4096:
+            self._emergency_lists.clear()
+        self._emergency_lists[key] = merged
+        return merged
+
+    def emergency_helplines(self, rules, state, emergency_type, secondary_types=(), limit=6):
+        """
+        Helplines for an emergency: type-matching first, then the other national ones, then the
+        lead helpline of each secondary type, then the other state ones
+        """
+        head, national_rest, local_rest, numbers = self._merged_emergency_list(rules, state, emergency_type)
+
+        leads = []
+        lead_numbers = set()
+        for secondary_type in secondary_types:
+            for candidate in rules.lead_candidates.get(secondary_type, ()):
+                if candidate['number'] not in numbers and candidate['number'] not in lead_numbers:
+                    lead_numbers.add(candidate['number'])
+                    leads.append(candidate)
+                    break
+
+        ordered = head + national_rest + tuple(leads) + local_rest
+        return [dict(helpline) for helpline in ordered[:limit]]
+
+
+def build_directory(catalog, directory):
+    directory = HelplineDirectory(catalog, directory)
+    logger.info("☎️ Helpline directory v%d: %d central, %d states with emergency helplines",
+                directory.version, len(directory.central), len(directory.state_helplines))
+    return directory
+
+
+_catalog = register('helplines', [HELPLINE_FILE, DIRECTORY_FILE], build_directory)
+
+
+def get_directory():
+    """
+    Current helpline directory (swapped by the catalog watcher when either data file changes)
+    """
+    return _catalog.get()
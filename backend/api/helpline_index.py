@@ -0,0 +1,80 @@
+import hashlib
+import logging
+import threading
+from .compression import ENCODINGS, MIN_BYTES, compress_body
+from .helpline_directory import get_directory
+from .json_provider import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+# Serialized responses kept for states that have no state-level helplines
+MAX_EXTRA_STATES = 256
+
+_lock = threading.Lock()
+_state = {
+    'directory': None,
+    'responses': {}
+}
+
+
+def serialize_response(state, helplines):
+    """
+    JSON body (same encoding as jsonify) by content-encoding, with its strong ETag.
+    The gzip/br variants are built here once instead of by the compression hook per request.
+    """
+    body = dumps_bytes({'state': state, 'helplines': helplines}, sort_keys=True) + b'\n'
+    variants = {'identity': body}
+    if len(body) >= MIN_BYTES:
+        for encoding in ENCODINGS:
+            compressed = compress_body(body, encoding)
+            if len(compressed) < len(body):
+                variants[encoding] = compressed
+    return variants, hashlib.sha256(body).hexdigest()[:32]
+
+
+def _refresh_if_changed():
+    """
+    Re-serialize every state's response when the helpline directory was rebuilt
+    """
+    directory = get_directory()
+    if _state['directory'] is directory:
+        return
+
+    with _lock:
+        if _state['directory'] is directory:
+            return
+        responses = {
+            state: serialize_response(state, list(entries))
+            for state, entries in directory.catalog_by_state.items()
+        }
+        _state['responses'] = responses
+        _state['directory'] = directory
+        logger.info("☎️ Prebuilt helpline responses for %d states", len(responses))
+
+
+def load_helpline_index():
+    """
+    Build the index at startup instead of on the first request
+    """
+    _refresh_if_changed()
+
+
+def get_helpline_response(state):
+    """
+    Prebuilt ({encoding: body bytes}, etag) for a state, or None if no helplines apply to it
+    """
+    _refresh_if_changed()
+    responses = _state['responses']
+    cached = responses.get(state)
+    if cached is not None:
+        return cached
+
+    directory = _state['directory']
+    helplines = directory.catalog_for_state(state)
+    if not helplines:
+        return None
+    cached = serialize_response(state, list(helplines))
+    # Unknown state names come from the client, so only a bounded number are kept
+    if len(responses) < len(directory.catalog_by_state) + MAX_EXTRA_STATES:
+        responses[state] = cached
+    return cached
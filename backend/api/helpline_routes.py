@@ -1,33 +1,64 @@
-from flask import Blueprint, request, jsonify
-import json
+from flask import Blueprint, request, jsonify, Response
+from .catalog import get_catalog
+from .compression import choose_encoding
+from .helpline_index import get_helpline_response
+from .helpline_search import search_helplines, DEFAULT_LIMIT
 
 helpline_bp = Blueprint('helpline', __name__)
 
-def load_helpline_data():
-    with open('data/helpline.json', 'r') as f:
-        return json.load(f)
+@helpline_bp.after_request
+def add_catalog_version(response):
+    # Content digest of the helpline files the response was built from
+    response.headers['X-Catalog-Version'] = get_catalog('helplines').snapshot().digest
+    return response
 
 @helpline_bp.route('', methods=['GET'])
 @helpline_bp.route('/', methods=['GET'])
 def get_helpline_numbers():
     state = request.args.get('state')
-    
+
     if not state:
         return jsonify({'error': 'state parameter is required'}), 400
-    
-    helpline_data = load_helpline_data()
-    helplines = helpline_data.get('helplines', [])
-    
-    # Filter helplines for the requested state (both Central and State-specific)
-    state_helplines = []
-    for helpline in helplines:
-        if helpline['level'] == 'Central' or (helpline['level'] == 'State' and helpline['state'] == state):
-            state_helplines.append(helpline)
-    
-    if not state_helplines:
+
+    # Central and state helplines are prebuilt per state, already serialized
+    prebuilt = get_helpline_response(state)
+
+    if prebuilt is None:
         return jsonify({'error': f'Helpline data not available for {state}'}), 404
-    
+
+    variants, etag = prebuilt
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding not in variants:
+        encoding = 'identity'
+    response = Response(variants[encoding], mimetype='application/json')
+    if len(variants) > 1:
+        response.vary.add('Accept-Encoding')
+    if encoding == 'identity':
+        response.set_etag(etag)
+    else:
+        # Compressed variants are prebuilt with the index, so the compression hook leaves them alone
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f'{etag}-{encoding}')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@helpline_bp.route('/search', methods=['GET'])
+def search_helpline_numbers():
+    """
+    Type-ahead search over helpline services, numbers and notes
+    """
+    query = request.args.get('q', '')
+    state = request.args.get('state')
+
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+
+    results = search_helplines(query, limit=limit, state=state)
+
     return jsonify({
-        'state': state,
-        'helplines': state_helplines
-    }), 200 
\ No newline at end of file
+        'query': query,
+        'results': results,
+        'total': len(results)
+    }), 200
@@ -0,0 +1,231 @@
+import logging
+import re
+import threading
+from .helpline_directory import get_directory
+
+logger = logging.getLogger(__name__)
+
+# Token weights per field: a hit in the service name or number outranks one in the notes
+FIELD_WEIGHTS = {'service': 3.0, 'number': 3.0, 'state': 1.5, 'notes': 1.0}
+
+# Fuzzy (trigram) matches count for less than prefix matches
+FUZZY_WEIGHT = 0.6
+MIN_TRIGRAM_SIMILARITY = 0.35
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 50
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return _TOKEN.findall((text or '').lower())
+
+
+def trigrams(token):
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def search_documents(directory):
+    """
+    One search document per helpline: the /api/helpline catalog plus the state emergency helplines
+    """
+    documents = []
+    seen = set()
+    for helpline in directory.central + tuple(h for entries in directory.catalog_by_state.values() for h in entries):
+        key = (helpline['number'], helpline.get('state'))
+        if key in seen:
+            continue
+        seen.add(key)
+        documents.append({
+            'service': helpline.get('service', ''),
+            'number': helpline['number'],
+            'notes': helpline.get('notes') or '',
+            'state': helpline.get('state'),
+            'level': helpline.get('level')
+        })
+    for state, entries in directory.state_helplines.items():
+        for helpline in entries:
+            key = (helpline['number'], state)
+            if key in seen:
+                continue
+            seen.add(key)
+            documents.append({
+                'service': helpline.get('name', ''),
+                'number': helpline['number'],
+                'notes': helpline.get('description') or '',
+                'state': state,
+                'level': 'State',
+                'type': helpline.get('type')
+            })
+    return documents
+
+
+class HelplineSearchIndex:
+    """
+    Prefix trie over the tokens of every helpline's service name, number, state and notes,
+    plus a trigram index over the vocabulary for typo tolerance.
+
+    Each trie node stores its documents already ranked by best field weight, so a
+    type-ahead lookup is a walk down the query's characters.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+
+        # Best field weight of each token in each document
+        token_weights = {}
+        for doc_id, document in enumerate(documents):
+            fields = {
+                'service': document['service'],
+                'number': document['number'],
+                'state': document.get('state') or '',
+                'notes': document['notes']
+            }
+            for field, text in fields.items():
+                tokens = tokenize(text)
+                if field == 'number':
+                    # "040-23300114" is also typed without separators
+                    tokens += [''.join(ch for ch in part if ch.isdigit()) for part in text.split('/')]
+                for token in tokens:
+                    if not token:
+                        continue
+                    postings = token_weights.setdefault(token, {})
+                    postings[doc_id] = max(postings.get(doc_id, 0.0), FIELD_WEIGHTS[field])
+        self.vocabulary = token_weights
+
+        # Trie: goto[node] maps a character to the next node; postings[node] holds doc -> weight
+        self.goto = [{}]
+        node_postings = [{}]
+        for token, postings in token_weights.items():
+            node = 0
+            for ch in token:
+                next_node = self.goto[node].get(ch)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][ch] = next_node
+                    self.goto.append({})
+                    node_postings.append({})
+                node = next_node
+                merged = node_postings[node]
+                for doc_id, weight in postings.items():
+                    if weight > merged.get(doc_id, 0.0):
+                        merged[doc_id] = weight
+
+        # Ranked (doc_id, weight) tuples per node; ties keep catalog order
+        self.ranked = [
+            tuple(sorted(postings.items(), key=lambda item: (-item[1], item[0])))
+            for postings in node_postings
+        ]
+
+        self.trigram_tokens = {}
+        self.trigram_counts = {}
+        for token in token_weights:
+            token_trigrams = trigrams(token)
+            self.trigram_counts[token] = len(token_trigrams)
+            for trigram in token_trigrams:
+                self.trigram_tokens.setdefault(trigram, set()).add(token)
+
+    def prefix_matches(self, prefix):
+        node = 0
+        for ch in prefix:
+            node = self.goto[node].get(ch)
+            if node is None:
+                return ()
+        return self.ranked[node]
+
+    def fuzzy_matches(self, token):
+        """
+        Documents containing vocabulary tokens similar to token (Dice coefficient over trigrams)
+        """
+        query = trigrams(token)
+        shared = {}
+        for trigram in query:
+            for candidate in self.trigram_tokens.get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        scores = {}
+        for candidate, count in shared.items():
+            similarity = 2.0 * count / (len(query) + self.trigram_counts[candidate])
+            if similarity < MIN_TRIGRAM_SIMILARITY:
+                continue
+            for doc_id, weight in self.vocabulary[candidate].items():
+                score = weight * similarity * FUZZY_WEIGHT
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        return scores
+
+    def search(self, query, limit=DEFAULT_LIMIT, state=None):
+        """
+        Top matches for a (partial) query. Every query token must match a document, by
+        prefix or, failing that, fuzzily. `state` limits results to central helplines
+        plus that state's.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        # Type-ahead fast path: one token with prefix hits is already ranked in the trie
+        if len(tokens) == 1:
+            ranked = self.prefix_matches(tokens[0])
+            if ranked:
+                return self._collect(ranked, (), limit, state)
+
+        scores = None
+        fuzzy_docs = set()
+        for token in tokens:
+            token_scores = dict(self.prefix_matches(token))
+            if not token_scores:
+                token_scores = self.fuzzy_matches(token)
+                fuzzy_docs.update(token_scores)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_id: score + token_scores[doc_id] for doc_id, score in scores.items() if doc_id in token_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return self._collect(ranked, fuzzy_docs, limit, state)
+
+    def _collect(self, ranked, fuzzy_docs, limit, state):
+        results = []
+        for doc_id, score in ranked:
+            document = self.documents[doc_id]
+            if state and document['level'] != 'Central' and document['state'] != state:
+                continue
+            result = dict(document)
+            result['score'] = round(score, 3)
+            result['match'] = 'fuzzy' if doc_id in fuzzy_docs else 'prefix'
+            results.append(result)
+            if len(results) >= limit:
+                break
+        return results
+
+
+_lock = threading.Lock()
+_state = {
+    'directory': None,
+    'index': None
+}
+
+
+def get_search_index():
+    """
+    Search index for the current helpline directory, rebuilt when the directory is
+    """
+    directory = get_directory()
+    if _state['directory'] is directory:
+        return _state['index']
+
+    with _lock:
+        if _state['directory'] is not directory:
+            _state['index'] = HelplineSearchIndex(search_documents(directory))
+            _state['directory'] = directory
+            logger.info("🔎 Indexed %d helplines for search", len(_state['index'].documents))
+    return _state['index']
+
+
+def search_helplines(query, limit=DEFAULT_LIMIT, state=None):
+    return get_search_index().search(query, limit=min(max(limit, 1), MAX_LIMIT), state=state)
@@ -0,0 +1,145 @@
+"""
+Idempotency-Key support for endpoints with side effects (complaint filing writes the
+store and sends two emails).
+
+The first request with a given key runs the view; its response is kept for
+IDEMPOTENCY_TTL seconds (24h) and replayed, unchanged, for later requests with the same
+key, with an `Idempotent-Replayed: true` header. A duplicate that arrives while the first
+is still running waits for it (up to IDEMPOTENCY_WAIT_SECONDS) instead of running again.
+Reusing a key with a different request body is rejected with 422. Server errors are not
+kept, so a retry after a 5xx runs the view again.
+
+At most IDEMPOTENCY_MAX_KEYS responses are kept, oldest evicted first. The store is per
+process: duplicates are absorbed when they reach the same worker.
+"""
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, jsonify, make_response, request
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+TTL_SECONDS = float(os.getenv('IDEMPOTENCY_TTL', str(24 * 3600)))
+MAX_KEYS = int(os.getenv('IDEMPOTENCY_MAX_KEYS', '10000'))
+WAIT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', '30'))
+
+
+class Entry:
+    """
+    One key: pending until the first request finishes, then its stored response
+    """
+
+    def __init__(self, fingerprint, now):
+        self.fingerprint = fingerprint
+        self.created = now
+        self.done = threading.Event()
+        self.response = None
+
+    def replay(self):
+        status, body, headers = self.response
+        response = current_app.response_class(body, status=status, headers=headers)
+        response.headers[REPLAYED_HEADER] = 'true'
+        return response
+
+
+class IdempotencyStore:
+    """
+    Bounded key -> Entry map with a TTL, oldest first
+    """
+
+    def __init__(self, ttl=TTL_SECONDS, max_keys=MAX_KEYS):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _expire(self, now):
+        # Entries are in creation order, so expired ones come first. Requests still
+        # running are never dropped: their duplicates are waiting on them.
+        excess = len(self.entries) - self.max_keys + 1
+        stale = []
+        for key, entry in self.entries.items():
+            if excess <= 0 and now - entry.created < self.ttl:
+                break
+            if entry.done.is_set():
+                stale.append(key)
+                excess -= 1
+        for key in stale:
+            del self.entries[key]
+
+    def claim(self, key, fingerprint):
+        """
+        (entry, True) when the caller should run the request, (entry, False) for a duplicate
+        """
+        now = time.monotonic()
+        with self.lock:
+            self._expire(now)
+            entry = self.entries.get(key)
+            if entry is not None:
+                return entry, False
+            entry = self.entries[key] = Entry(fingerprint, now)
+            return entry, True
+
+    def complete(self, key, entry, response):
+        """
+        Keep a finished response for replay, or forget the key (response None) so it can be retried
+        """
+        with self.lock:
+            if response is None:
+                if self.entries.get(key) is entry:
+                    del self.entries[key]
+            else:
+                entry.response = response
+        entry.done.set()
+
+
+def _snapshot(response):
+    """
+    (status, body, headers) to rebuild the response later
+    """
+    headers = [(name, value) for name, value in response.headers.items()
+               if name.lower() not in ('content-length', 'set-cookie')]
+    return response.status_code, response.get_data(), headers
+
+
+def idempotent(store):
+    """
+    View decorator honouring the Idempotency-Key header; requests without one run as usual
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return view(*args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return jsonify({'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'}), 400
+
+            scoped_key = (request.endpoint, key)
+            fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+            entry, owner = store.claim(scoped_key, fingerprint)
+
+            if not owner:
+                if entry.fingerprint != fingerprint:
+                    return jsonify({'error': f'{HEADER} was already used for a different request'}), 422
+                if not entry.done.wait(WAIT_SECONDS):
+                    return jsonify({'error': 'A request with this Idempotency-Key is still being processed'}), 409
+                if entry.response is None:
+                    # The first attempt failed and was forgotten; this one is retried afresh
+                    return wrapper(*args, **kwargs)
+                return entry.replay()
+
+            try:
+                response = make_response(view(*args, **kwargs))
+            except BaseException:
+                store.complete(scoped_key, entry, None)
+                raise
+            store.complete(scoped_key, entry, None if response.status_code >= 500 else _snapshot(response))
+            return response
+        return wrapper
+    return decorator
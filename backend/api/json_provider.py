@@ -0,0 +1,139 @@
+"""
+JSON encoding for responses and data files, using orjson when it is installed.
+
+OrjsonProvider replaces Flask's default provider for jsonify and request.get_json().
+It keeps Flask's behaviour (sorted keys, RFC 822 dates, dataclasses, UUIDs) but leaves
+non-ASCII text unescaped, so Hindi and other Indic strings stay one byte sequence instead
+of six-character escapes. Anything orjson cannot encode (e.g. integers beyond 64 bits)
+falls back to the stdlib encoder.
+
+read_json / write_json are used by the JSON stores (complaints, users, email logs).
+Writes are compact and atomic (temporary file + rename), so a reader never sees a
+half-written store.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from flask.json.provider import DefaultJSONProvider
+from .metrics import observe_store_io
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # stdlib json is used instead
+    orjson = None
+
+_MISSING = object()
+
+
+def _orjson_options(sort_keys, indent):
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        options |= orjson.OPT_SORT_KEYS
+    if indent:
+        options |= orjson.OPT_INDENT_2
+    return options
+
+
+def dumps_bytes(data, sort_keys=False, indent=False, default=None):
+    """
+    UTF-8 JSON bytes, compact unless indent is set
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=default, option=_orjson_options(sort_keys, indent))
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(
+        data, default=default, ensure_ascii=False, sort_keys=sort_keys,
+        indent=2 if indent else None, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path, default=_MISSING):
+    """
+    Parse a JSON file; with a default, a missing or corrupt file returns it instead of raising
+    """
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    except (FileNotFoundError, ValueError):
+        if default is _MISSING:
+            raise
+        return default
+    finally:
+        observe_store_io(os.path.basename(path), 'read', time.perf_counter() - start)
+
+
+def write_json(path, data):
+    """
+    Atomically replace a JSON file with the compact encoding of data
+    """
+    start = time.perf_counter()
+    body = dumps_bytes(data)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        # mkstemp creates the file private to the owner; keep the store's permissions
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    observe_store_io(os.path.basename(path), 'write', time.perf_counter() - start)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, with Flask's default types via DefaultJSONProvider.default
+    """
+
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        # Only the options orjson understands; anything else goes to the stdlib encoder
+        if set(kwargs) - {'indent', 'separators', 'sort_keys', 'default'}:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(
+            obj,
+            sort_keys=kwargs.get('sort_keys', self.sort_keys),
+            indent=bool(kwargs.get('indent')),
+            default=kwargs.get('default', self.default)
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent, default=self.default)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def init_json(app):
+    """
+    Use orjson for jsonify and request parsing when it is installed
+    """
+    if orjson is None:
+        logger.warning("⚠️ orjson not installed, using the standard JSON encoder")
+        return
+    app.json = OrjsonProvider(app)
@@ -0,0 +1,99 @@
+from collections import deque
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over multilingual keywords grouped by category.
+
+    Built once from {category: [keywords]}; a single pass over the text finds every
+    keyword occurrence for every category. Matching is plain substring matching, the
+    same as `keyword in text`, so callers should lowercase the text first.
+    """
+
+    def __init__(self, keyword_map):
+        self.keyword_map = {category: tuple(keywords) for category, keywords in keyword_map.items()}
+
+        # Trie: goto[state] maps a character to the next state
+        self.goto = [{}]
+        keyword_outputs = [set()]
+
+        for category, keywords in self.keyword_map.items():
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                state = 0
+                for ch in keyword:
+                    next_state = self.goto[state].get(ch)
+                    if next_state is None:
+                        next_state = len(self.goto)
+                        self.goto[state][ch] = next_state
+                        self.goto.append({})
+                        keyword_outputs.append(set())
+                    state = next_state
+                keyword_outputs[state].add((category, keyword))
+
+        # Failure links (breadth first), merging outputs along the failure chain
+        self.fail = [0] * len(self.goto)
+        queue = deque()
+        for next_state in self.goto[0].values():
+            queue.append(next_state)
+
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(ch, 0)
+                keyword_outputs[next_state] |= keyword_outputs[self.fail[next_state]]
+
+        self.outputs = [tuple(sorted(output)) for output in keyword_outputs]
+        self.category_outputs = [frozenset(category for category, _ in output) for output in self.outputs]
+        self.alphabet = frozenset(ch for transitions in self.goto for ch in transitions)
+
+    def categories(self, text):
+        """
+        Set of categories with at least one keyword in text
+        """
+        goto = self.goto
+        fail = self.fail
+        alphabet = self.alphabet
+        category_outputs = self.category_outputs
+        found = set()
+        state = 0
+
+        for ch in text:
+            if ch not in alphabet:
+                # No keyword contains this character, so every partial match ends here
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if category_outputs[state]:
+                found |= category_outputs[state]
+        return found
+
+    def matches(self, text):
+        """
+        Map each matched category to the set of its keywords found in text
+        """
+        goto = self.goto
+        fail = self.fail
+        alphabet = self.alphabet
+        outputs = self.outputs
+        found = {}
+        state = 0
+
+        for ch in text:
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for category, keyword in outputs[state]:
+                found.setdefault(category, set()).add(keyword)
+        return found
+
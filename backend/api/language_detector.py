@@ -0,0 +1,150 @@
+"""
+Fast language detection from Unicode script ranges.
+
+One pass over the code points counts letters per script: the Indic blocks are each
+128 code points (`code_point >> 7` identifies the block) and a str.translate table
+does the per-character work in C. The dominant script picks the language; Devanagari
+is split into Hindi/Marathi and Latin into English/romanized Hindi with small
+marker-word heuristics.
+"""
+import re
+
+LATIN = 'Latin'
+COMMON = 'Common'
+
+# 128-code-point block (code_point >> 7) -> script
+BLOCK_SCRIPTS = {
+    0x0600 >> 7: 'Arabic',
+    0x0680 >> 7: 'Arabic',
+    0x0900 >> 7: 'Devanagari',
+    0x0980 >> 7: 'Bengali',
+    0x0A00 >> 7: 'Gurmukhi',
+    0x0A80 >> 7: 'Gujarati',
+    0x0B00 >> 7: 'Odia',
+    0x0B80 >> 7: 'Tamil',
+    0x0C00 >> 7: 'Telugu',
+    0x0C80 >> 7: 'Kannada',
+    0x0D00 >> 7: 'Malayalam'
+}
+
+SCRIPT_LANGUAGES = {
+    'Arabic': 'Urdu',
+    'Devanagari': 'Hindi',
+    'Bengali': 'Bengali',
+    'Gurmukhi': 'Punjabi',
+    'Gujarati': 'Gujarati',
+    'Odia': 'Odia',
+    'Tamil': 'Tamil',
+    'Telugu': 'Telugu',
+    'Kannada': 'Kannada',
+    'Malayalam': 'Malayalam',
+    LATIN: 'English'
+}
+
+# Devanagari words common in Marathi but not in Hindi; ळ is rare in Hindi
+MARATHI_MARKERS = frozenset([
+    'आहे', 'आहेत', 'नाही', 'माझ्या', 'माझा', 'माझी', 'माझे', 'मला', 'आणि', 'करा', 'झाला', 'झाली', 'आमच्या', 'खूप'
+])
+MARATHI_LETTER = 'ळ'
+
+# Romanized Hindi function words and everyday emergency words that are not English words
+ROMANIZED_HINDI_MARKERS = frozenset([
+    'hai', 'hain', 'nahi', 'nahin', 'mera', 'meri', 'mere', 'mujhe', 'humein', 'hamara', 'hamare',
+    'kya', 'kyun', 'kaise', 'kahan', 'bachao', 'madad', 'jaldi', 'raha', 'rahi', 'rahe', 'gaya',
+    'gayi', 'karo', 'kijiye', 'chahiye', 'ghar', 'paani', 'pani', 'bijli', 'aag', 'ladki', 'bachcha',
+    'bacha', 'aur', 'lekin', 'abhi', 'yahan', 'wahan', 'koi', 'kuch', 'bahut', 'kar', 'ko', 'ki', 'ka',
+    'ke', 'se', 'hua', 'hui', 'diya', 'gaye'
+])
+ROMANIZED_MIN_MARKERS = 2
+ROMANIZED_MIN_SHARE = 0.2
+
+_DEVANAGARI_WORD = re.compile(r'[ऀ-ॿ]+')
+_LATIN_WORD = re.compile(r'[a-z]+')
+
+
+def _build_script_table():
+    """
+    str.translate table mapping every letter of a known script to one private-use tag character
+    """
+    table = {}
+    for block, script in BLOCK_SCRIPTS.items():
+        for code_point in range(block << 7, (block + 1) << 7):
+            table[code_point] = SCRIPT_TAGS[script]
+    for ch in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        table[ord(ch)] = SCRIPT_TAGS[LATIN]
+    return table
+
+
+SCRIPT_TAGS = {script: chr(0xE000 + i) for i, script in enumerate(SCRIPT_LANGUAGES)}
+_SCRIPT_TABLE = _build_script_table()
+
+
+def script_counts(text):
+    """
+    Letters per script; digits, punctuation and unknown scripts are skipped.
+    The per-character pass happens inside str.translate, then each tag is counted.
+    """
+    tagged = text.translate(_SCRIPT_TABLE)
+    counts = {}
+    for script, tag in SCRIPT_TAGS.items():
+        count = tagged.count(tag)
+        if count:
+            counts[script] = count
+    return counts
+
+
+def keyword_script(keyword):
+    """
+    Script of the first letter in a keyword, or COMMON if it has none (e.g. "108")
+    """
+    for ch in keyword:
+        code_point = ord(ch)
+        if code_point < 128:
+            if ('a' <= ch <= 'z') or ('A' <= ch <= 'Z'):
+                return LATIN
+            continue
+        script = BLOCK_SCRIPTS.get(code_point >> 7)
+        if script:
+            return script
+    return COMMON
+
+
+def is_romanized_hindi(text_lower):
+    words = _LATIN_WORD.findall(text_lower)
+    markers = sum(1 for word in words if word in ROMANIZED_HINDI_MARKERS)
+    return markers >= ROMANIZED_MIN_MARKERS and markers >= ROMANIZED_MIN_SHARE * len(words)
+
+
+def is_marathi(text):
+    if MARATHI_LETTER in text:
+        return True
+    return any(word in MARATHI_MARKERS for word in _DEVANAGARI_WORD.findall(text))
+
+
+def detect_language(text):
+    """
+    Detect the language of text from its scripts.
+
+    Returns {'language', 'script', 'confidence', 'romanized'}; language and script are
+    None when the text has no letters.
+    """
+    counts = script_counts(text)
+    if not counts:
+        return {'language': None, 'script': None, 'confidence': 0.0, 'romanized': False}
+
+    script = max(counts, key=counts.get)
+    language = SCRIPT_LANGUAGES[script]
+    romanized = False
+
+    if script == 'Devanagari' and is_marathi(text):
+        language = 'Marathi'
+    elif script == LATIN and is_romanized_hindi(text.lower()):
+        language = 'Hindi'
+        romanized = True
+
+    return {
+        'language': language,
+        'script': script,
+        'confidence': round(counts[script] / sum(counts.values()), 3),
+        'romanized': romanized
+    }
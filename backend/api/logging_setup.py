@@ -0,0 +1,165 @@
+"""
+Structured logging: one JSON object per line on stdout, written off the request thread.
+
+Modules log through logging.getLogger(__name__). Records go to a QueueHandler, which
+only adds the request ID and puts them on an in-memory queue; a QueueListener thread
+formats and writes them, so a slow stdout or log shipper never holds up a request.
+
+Environment:
+    LOG_LEVEL               root level (INFO)
+    LOG_LEVELS              per-module overrides, e.g. "api.complaint_routes=DEBUG,api.catalog=WARNING"
+    LOG_FORMAT              json (default) or text
+    LOG_DEBUG_SAMPLE_RATE   fraction of DEBUG records kept (1.0), for noisy debug lines
+
+Every request gets an ID (the client's X-Request-ID when it sends a sane one), attached
+to the records logged while serving it and echoed in the X-Request-ID response header.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from flask import g, has_request_context, request
+from .json_provider import dumps_bytes
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+
+# Attributes every LogRecord has; anything else was passed via extra= and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'request_id'}
+
+_handler = None
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            entry['requestId'] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return dumps_bytes(entry, default=str).decode('utf-8')
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s %(request_tag)s%(message)s')
+
+    def format(self, record):
+        record.request_tag = f'[{record.request_id}] ' if getattr(record, 'request_id', None) else ''
+        return super().format(record)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Runs in the thread that logs: tags the record with the current request ID and samples DEBUG records
+    """
+
+    def __init__(self, debug_sample_rate):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record):
+        if record.levelno <= logging.DEBUG and self.debug_sample_rate < 1 and random.random() >= self.debug_sample_rate:
+            return False
+        record.request_id = g.get('request_id') if has_request_context() else None
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records with their message and traceback rendered but fields intact, so the
+    listener can still format them as JSON (the stock prepare() flattens them to text)
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(spec):
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, level = item.partition('=')
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener():
+    global _listener
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(TextFormatter() if os.getenv('LOG_FORMAT', 'json') == 'text' else JsonFormatter())
+    _handler.queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=False)
+    _listener.start()
+
+
+def stop_logging():
+    """
+    Write out queued records and stop the listener thread
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging():
+    """
+    Route the root logger through the queue; safe to call more than once
+    """
+    global _handler
+    if _handler is not None:
+        return
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    for name, level in _parse_levels(os.getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(level)
+
+    _handler = StructuredQueueHandler(queue.SimpleQueue())
+    _handler.addFilter(ContextFilter(float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1'))))
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+
+    _start_listener()
+    atexit.register(stop_logging)
+    # The listener thread does not survive fork: gunicorn workers start their own
+    os.register_at_fork(after_in_child=_start_listener)
+
+
+def _assign_request_id():
+    supplied = request.headers.get(REQUEST_ID_HEADER, '')
+    g.request_id = supplied if _VALID_REQUEST_ID.match(supplied) else uuid.uuid4().hex
+
+
+def _echo_request_id(response):
+    if 'request_id' in g:
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+    return response
+
+
+def init_logging(app):
+    configure_logging()
+    app.before_request(_assign_request_id)
+    app.after_request(_echo_request_id)
@@ -0,0 +1,201 @@
+"""
+Process metrics in the Prometheus text exposition format, served from GET /metrics.
+
+Counters, gauges and fixed-bucket histograms keyed by label values, each updated under
+its own lock with a dict lookup and (for histograms) a bisect, so recording costs a few
+microseconds per request. Under gunicorn every worker keeps its own series; scrape with
+a per-worker target or sum them downstream.
+"""
+import bisect
+import threading
+import time
+from flask import g, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency bucket upper bounds (seconds): sub-millisecond lookups up to slow Gemini calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+IO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+_registry = []
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+            for labels, value in items:
+                lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # Per-bucket counts (last one is +Inf), then sum
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._values.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-1])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+def register_collector(collect):
+    """
+    collect() is called at scrape time and returns exposition lines (for values that are
+    cheaper to read on demand than to track, e.g. catalog versions)
+    """
+    _collectors.append(collect)
+
+
+def render_metrics():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for collect in _collectors:
+        lines.extend(collect())
+    return '\n'.join(lines) + '\n'
+
+
+HTTP_REQUESTS = Counter(
+    'janai_http_requests_total', 'HTTP requests by blueprint, endpoint, method and status',
+    ('blueprint', 'endpoint', 'method', 'status')
+)
+HTTP_LATENCY = Histogram(
+    'janai_http_request_duration_seconds', 'HTTP request latency by blueprint and endpoint',
+    ('blueprint', 'endpoint')
+)
+HTTP_IN_FLIGHT = Gauge('janai_http_requests_in_flight', 'Requests currently being served')
+STORE_IO = Histogram(
+    'janai_store_io_duration_seconds', 'JSON store read/write duration', ('store', 'operation'), buckets=IO_BUCKETS
+)
+SMTP_SEND = Histogram(
+    'janai_smtp_send_duration_seconds', 'SMTP send duration by email kind and outcome', ('kind', 'outcome')
+)
+GEMINI_CALLS = Counter(
+    'janai_gemini_calls_total', 'Gemini calls and fallbacks by prompt type and outcome', ('prompt_type', 'outcome')
+)
+GEMINI_LATENCY = Histogram(
+    'janai_gemini_call_duration_seconds', 'Gemini round-trip latency by prompt type', ('prompt_type',)
+)
+
+
+def observe_store_io(store, operation, seconds):
+    STORE_IO.observe(seconds, store, operation)
+
+
+def observe_smtp_send(kind, outcome, seconds):
+    SMTP_SEND.observe(seconds, kind, outcome)
+
+
+def observe_gemini_call(prompt_type, outcome, elapsed_ms):
+    GEMINI_CALLS.inc(prompt_type, outcome)
+    if elapsed_ms is not None:
+        GEMINI_LATENCY.observe(elapsed_ms / 1000.0, prompt_type)
+
+
+def _record_request(status):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return
+    blueprint = request.blueprint or 'app'
+    endpoint = request.endpoint or 'unmatched'
+    HTTP_REQUESTS.inc(blueprint, endpoint, request.method, str(status))
+    HTTP_LATENCY.observe(time.perf_counter() - started, blueprint, endpoint)
+
+
+def _before_request():
+    HTTP_IN_FLIGHT.inc()
+    g._metrics_started = time.perf_counter()
+
+
+def _after_request(response):
+    _record_request(response.status_code)
+    return response
+
+
+def _teardown_request(error):
+    # after_request is skipped for unhandled exceptions; those count as 500s
+    _record_request(500)
+    HTTP_IN_FLIGHT.dec()
+
+
+def init_metrics(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
@@ -0,0 +1,129 @@
+"""
+Offline emergency bundle: every (state x emergency type x language) helpline and
+response result, precomputed into content-hashed static JSON shards that the
+frontend can use without the API.
+
+Build after the React build (which replaces frontend_build), from the backend directory:
+
+    python -m api.offline_bundle [--output frontend_build/offline]
+
+Layout:
+    offline/manifest.json                  shard names for the current build (revalidated)
+    offline/helplines.<hash>.json          every distinct helpline, referenced by index
+    offline/state-<slug>.<hash>.json       {emergency type: [helpline indices]} for one state
+    offline/responses-<slug>.<hash>.json   {emergency type: response text} for one language
+"""
+import argparse
+import hashlib
+import os
+import re
+from datetime import datetime
+from .catalog import BACKEND_DIR
+from .classification_rules import get_rules
+from .helpline_directory import get_directory
+from .json_provider import dumps_bytes
+
+BUNDLE_DIR = os.path.join(BACKEND_DIR, 'frontend_build', 'offline')
+NATIONAL = 'All India'
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def encode(data):
+    # Sorted keys keep the bytes, and so the content hashes, stable across builds
+    return dumps_bytes(data, sort_keys=True)
+
+
+def shard_name(prefix, body):
+    return f"{prefix}.{hashlib.sha256(body).hexdigest()[:12]}.json"
+
+
+def build_bundle(rules, directory):
+    """
+    Shard name -> bytes for every shard, plus the manifest
+    """
+    emergency_types = list(rules.type_priority) + ['general']
+    states = [NATIONAL] + sorted(set(rules.state_order) | set(directory.state_helplines))
+    languages = sorted(set(rules.language_codes.values()) | {rules.default_language})
+
+    # Distinct helplines, referenced by index from the state shards
+    helplines = []
+    helpline_index = {}
+    state_tables = {}
+    for state in states:
+        helpline_state = None if state == NATIONAL else state
+        table = {}
+        for emergency_type in emergency_types:
+            indices = []
+            for helpline in directory.emergency_helplines(rules, helpline_state, emergency_type):
+                key = encode(helpline)
+                if key not in helpline_index:
+                    helpline_index[key] = len(helplines)
+                    helplines.append(helpline)
+                indices.append(helpline_index[key])
+            table[emergency_type] = indices
+        state_tables[state] = table
+
+    shards = {}
+    body = encode(helplines)
+    helplines_shard = shard_name('helplines', body)
+    shards[helplines_shard] = body
+
+    state_shards = {}
+    for state, table in state_tables.items():
+        body = encode(table)
+        name = shard_name(f'state-{slugify(state)}', body)
+        shards[name] = body
+        state_shards[state] = name
+
+    response_shards = {}
+    for language in languages:
+        body = encode({emergency_type: rules.response_for(emergency_type, language) for emergency_type in emergency_types})
+        name = shard_name(f'responses-{slugify(language)}', body)
+        shards[name] = body
+        response_shards[language] = name
+
+    manifest = {
+        'version': 1,
+        'rulesVersion': rules.version,
+        'directoryVersion': directory.version,
+        'generatedAt': datetime.now().isoformat(),
+        'emergencyTypes': emergency_types,
+        'languageCodes': dict(rules.language_codes),
+        'helplines': helplines_shard,
+        'states': state_shards,
+        'responses': response_shards
+    }
+    return shards, manifest
+
+
+def write_bundle(output=BUNDLE_DIR):
+    shards, manifest = build_bundle(get_rules(), get_directory())
+    os.makedirs(output, exist_ok=True)
+
+    # Drop shards from earlier builds, with their precompressed siblings (python -m api.static_assets)
+    for name in os.listdir(output):
+        if name.endswith(('.json', '.json.gz', '.json.br')) and name.rsplit('.json', 1)[0] + '.json' not in shards:
+            os.remove(os.path.join(output, name))
+
+    for name, body in shards.items():
+        with open(os.path.join(output, name), 'wb') as f:
+            f.write(body)
+    with open(os.path.join(output, 'manifest.json'), 'wb') as f:
+        f.write(encode(manifest))
+
+    total = sum(len(body) for body in shards.values())
+    print(f"📦 Wrote {len(shards)} offline shards ({total / 1024:.0f} KB) to {output}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the offline emergency helpline bundle')
+    parser.add_argument('--output', default=BUNDLE_DIR)
+    args = parser.parse_args()
+    write_bundle(args.output)
+
+
+if __name__ == '__main__':
+    main()
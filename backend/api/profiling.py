@@ -0,0 +1,259 @@
+"""
+Opt-in per-request profiling, for finding out why a slow endpoint (e.g. emergency
+processing) is slow in a running server.
+
+A request is profiled when it carries `X-Profile: <PROFILE_TOKEN>` or is picked by
+PROFILE_SAMPLE_RATE (0-1). It runs under cProfile (PROFILE_MODE=cprofile, exact call
+counts) or a stack sampler thread (PROFILE_MODE=sampler, lower overhead) and the result is
+written to PROFILE_SPOOL_DIR as <time>-<endpoint>.pstats or .collapsed (one
+`frame;frame;frame count` line per stack, the flame graph input format). The newest
+PROFILE_KEEP files are kept. GET /api/profiles lists the top functions across them; it needs
+the token and is not served at all without one.
+The sampler only gets the GIL every switch interval (5 ms by default), so it suits the
+slow requests worth profiling; use cProfile for short ones.
+
+With neither PROFILE_TOKEN nor a sample rate set, no hooks are registered and requests
+take no extra work at all.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+from .catalog import data_path
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'X-Profile'
+MODES = ('cprofile', 'sampler')
+
+TOKEN = os.getenv('PROFILE_TOKEN', '')
+SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+MODE = os.getenv('PROFILE_MODE', 'cprofile')
+SPOOL_DIR = os.getenv('PROFILE_SPOOL_DIR', data_path('profiles'))
+KEEP = int(os.getenv('PROFILE_KEEP', '200'))
+SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '5'))
+PATH_PREFIX = '/api'
+
+# Only one cProfile profiler can be active per process; concurrent requests are not profiled
+_cprofile_lock = threading.Lock()
+
+
+def is_enabled():
+    return bool(TOKEN) or SAMPLE_RATE > 0
+
+
+def has_token(req):
+    supplied = req.headers.get(HEADER, '')
+    return bool(TOKEN) and hmac.compare_digest(supplied.encode('utf-8'), TOKEN.encode('utf-8'))
+
+
+def profiles_listed():
+    """
+    Profile listings exist only when a token is configured to guard them
+    """
+    return bool(TOKEN)
+
+
+def can_read_profiles(req):
+    """
+    Profile listings always need the token
+    """
+    return has_token(req)
+
+
+def _frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Samples one thread's stack every interval from a helper thread
+    """
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL_MS / 1000.0):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            # A sample taken while stop() joins this thread is not part of the request
+            if stack and not self._stop.is_set():
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class CProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        _cprofile_lock.release()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+def _should_profile():
+    if not request.path.startswith(PATH_PREFIX) or request.path == '/api/profiles':
+        return False
+    return has_token(request) or (SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE)
+
+
+def _start_profiler():
+    if MODE == 'sampler':
+        return StackSampler(threading.get_ident())
+    if not _cprofile_lock.acquire(blocking=False):
+        return None
+    return CProfiler()
+
+
+def _before_request():
+    if not _should_profile():
+        return
+    profiler = _start_profiler()
+    if profiler is not None:
+        g._profiler = profiler
+        g._profile_name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{request.endpoint or 'unmatched'}"
+        profiler.start()
+
+
+def _after_request(response):
+    if '_profiler' in g:
+        response.headers['X-Profile-File'] = g._profile_name
+    return response
+
+
+def _teardown_request(error):
+    profiler = g.pop('_profiler', None)
+    if profiler is None:
+        return
+    profiler.stop()
+    suffix = '.collapsed' if isinstance(profiler, StackSampler) else '.pstats'
+    try:
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        profiler.write(os.path.join(SPOOL_DIR, g._profile_name + suffix))
+        prune_spool()
+    except OSError as e:
+        logger.warning("⚠️ Could not write profile %s: %s", g._profile_name, e)
+
+
+def spool_files(limit=None):
+    """
+    Profile files in the spool directory, newest first
+    """
+    try:
+        names = [name for name in os.listdir(SPOOL_DIR) if name.endswith(('.pstats', '.collapsed'))]
+    except FileNotFoundError:
+        return []
+    # Names start with a sortable timestamp
+    names.sort(reverse=True)
+    return names[:limit] if limit else names
+
+
+def prune_spool(keep=None):
+    for name in spool_files()[keep or KEEP:]:
+        try:
+            os.unlink(os.path.join(SPOOL_DIR, name))
+        except FileNotFoundError:
+            pass
+
+
+def _top_cprofile(paths, top):
+    stats = pstats.Stats(*paths)
+    rows = []
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{line}({function})",
+            'calls': ncalls,
+            'selfMs': round(tottime * 1000, 3),
+            'cumulativeMs': round(cumtime * 1000, 3)
+        })
+    rows.sort(key=lambda row: row['selfMs'], reverse=True)
+    return rows[:top]
+
+
+def _top_sampled(paths, top):
+    own = Counter()
+    inclusive = Counter()
+    total = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                frames = stack.split(';')
+                count = int(count)
+                total += count
+                own[frames[-1]] += count
+                for frame in set(frames):
+                    inclusive[frame] += count
+    return [
+        {
+            'function': frame,
+            'samples': count,
+            'selfPercent': round(100.0 * count / total, 1),
+            'inclusivePercent': round(100.0 * inclusive[frame] / total, 1)
+        }
+        for frame, count in own.most_common(top)
+    ]
+
+
+def profile_summary(limit=20, top=25):
+    """
+    Top functions (by self time / self samples) across the newest `limit` profiles
+    """
+    names = spool_files(limit)
+    pstats_paths = [os.path.join(SPOOL_DIR, name) for name in names if name.endswith('.pstats')]
+    sampled_paths = [os.path.join(SPOOL_DIR, name) for name in names if name.endswith('.collapsed')]
+    return {
+        'enabled': is_enabled(),
+        'mode': MODE,
+        'sampleRate': SAMPLE_RATE,
+        'profiles': names,
+        'cprofile': _top_cprofile(pstats_paths, top) if pstats_paths else [],
+        'sampler': _top_sampled(sampled_paths, top) if sampled_paths else []
+    }
+
+
+def init_profiling(app):
+    """
+    Register the profiling hooks only when profiling is configured
+    """
+    if not is_enabled():
+        return
+    if MODE not in MODES:
+        raise ValueError(f"PROFILE_MODE must be one of {', '.join(MODES)}, got {MODE!r}")
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    logger.info("🔬 Request profiling on (%s, sample rate %s%s) -> %s",
+                MODE, SAMPLE_RATE, ", X-Profile header accepted" if TOKEN else "", SPOOL_DIR)
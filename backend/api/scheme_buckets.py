@@ -0,0 +1,63 @@
+import logging
+from .catalog import data_path, register
+from .scheme_eligibility import EligibilityEngine
+
+logger = logging.getLogger(__name__)
+
+SCHEMES_FILE = data_path('schemes.json')
+ELIGIBILITY_FILE = data_path('scheme_eligibility.json')
+
+
+class SchemeCatalog:
+    """
+    Scheme list, compiled eligibility engine and the precomputed bucket table for one version of the files
+    """
+
+    def __init__(self, schemes, engine, table):
+        self.schemes = schemes
+        self.engine = engine
+        self.table = table
+
+
+def get_bucket_key(engine, occupation, gender, age):
+    occupation_key = occupation if occupation in engine.occupations else 'Other'
+    gender_key = gender if gender in engine.genders else 'Other'
+    return (occupation_key, gender_key, engine.get_age_band(age))
+
+
+def build_bucket_table(engine):
+    """
+    Materialize the ranked scheme list for every occupation x gender x age band bucket
+    """
+    table = {}
+    for occupation in engine.occupations:
+        for gender in engine.genders:
+            for age_band, _ in engine.age_bands:
+                table[(occupation, gender, age_band)] = engine.eligible_schemes(occupation, gender, age_band)
+    return table
+
+
+def build_scheme_catalog(schemes_data, config):
+    schemes = schemes_data.get('schemes', [])
+    engine = EligibilityEngine(schemes, config)
+    catalog = SchemeCatalog(schemes, engine, build_bucket_table(engine))
+    logger.info("📚 Precomputed scheme recommendations for %d profile buckets", len(catalog.table))
+    return catalog
+
+
+_catalog = register('schemes', [SCHEMES_FILE, ELIGIBILITY_FILE], build_scheme_catalog)
+
+
+def get_all_schemes():
+    """
+    Full scheme catalog, as last loaded from schemes.json
+    """
+    return _catalog.get().schemes
+
+
+def find_schemes_for_profile(occupation, gender, age):
+    """
+    O(1) lookup of the precomputed, ranked scheme list for a user profile
+    """
+    catalog = _catalog.get()
+    return list(catalog.table.get(get_bucket_key(catalog.engine, occupation, gender, age), ()))
@@ -0,0 +1,108 @@
+"""
+Scheme eligibility engine.
+
+Eligibility rules are declarative data (data/scheme_eligibility.json): an ordered list
+where the first rule whose occupation / gender / age band conditions hold supplies the
+scheme category keywords. At load time every keyword is compiled into a bitset over the
+catalog (bit i set when scheme i's category contains it), so matching a rule is a few
+bitwise ORs/ANDs over the whole catalog rather than a scan per scheme.
+"""
+
+# Rule condition fields and the profile attribute each one tests
+CONDITIONS = (('occupation', 'occupation'), ('gender', 'gender'), ('ageBand', 'age_band'))
+
+
+def iter_bits(mask):
+    """
+    Indices of the set bits in mask, lowest first
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def rank_by_hits(keyword_masks, catalog_mask):
+    """
+    Scheme indices matching any keyword, most keyword hits first, catalog order on ties.
+
+    at_least[k] is the set of schemes matching at least k keywords, built with one
+    AND/OR per keyword and count (a bit-sliced counter over the whole catalog).
+    """
+    at_least = [catalog_mask] + [0] * len(keyword_masks)
+    for mask in keyword_masks:
+        for k in range(len(keyword_masks), 0, -1):
+            at_least[k] |= at_least[k - 1] & mask
+
+    ranked = []
+    for k in range(len(keyword_masks), 0, -1):
+        ranked.extend(iter_bits(at_least[k] & ~(at_least[k + 1] if k < len(keyword_masks) else 0)))
+    return ranked
+
+
+class EligibilityEngine:
+    """
+    Catalog and eligibility rules compiled into keyword bitsets and per-rule ranked results
+    """
+
+    def __init__(self, schemes, config):
+        self.schemes = list(schemes)
+        self.version = config.get('version', 0)
+        self.age_bands = [(band['name'], band['minAge']) for band in config.get('ageBands', [])]
+        self.default_age = config.get('defaultAge', 18)
+        self.occupations = list(config.get('occupations', []))
+        self.genders = list(config.get('genders', []))
+        self.general_limit = config.get('generalLimit', 8)
+        self.rules = list(config.get('rules', []))
+
+        self.catalog_mask = (1 << len(self.schemes)) - 1
+        categories = [scheme.get('category', '').lower() for scheme in self.schemes]
+
+        # One bitset per distinct keyword across all rules
+        self.keyword_masks = {}
+        for rule in self.rules:
+            for keyword in rule.get('categoryKeywords') or ():
+                if keyword not in self.keyword_masks:
+                    mask = 0
+                    for position, category in enumerate(categories):
+                        if keyword in category:
+                            mask |= 1 << position
+                    self.keyword_masks[keyword] = mask
+
+        # Ranked scheme tuple per rule; a rule without keywords lists the first general_limit schemes
+        self.rule_results = []
+        for rule in self.rules:
+            keywords = rule.get('categoryKeywords')
+            if keywords is None:
+                self.rule_results.append(tuple(self.schemes[:self.general_limit]))
+                continue
+            masks = [self.keyword_masks[keyword] for keyword in keywords]
+            self.rule_results.append(tuple(self.schemes[i] for i in rank_by_hits(masks, self.catalog_mask)))
+
+    def get_age_band(self, age):
+        """
+        Map an age (int or numeric string) to its band name
+        """
+        try:
+            age = int(float(age))
+        except (TypeError, ValueError):
+            age = self.default_age
+        band = self.age_bands[0][0]
+        for name, lowest in self.age_bands:
+            if age >= lowest:
+                band = name
+        return band
+
+    def match_rule(self, occupation, gender, age_band):
+        """
+        Index of the first rule whose conditions all hold, or None
+        """
+        profile = {'occupation': occupation, 'gender': gender, 'age_band': age_band}
+        for index, rule in enumerate(self.rules):
+            if all(rule[field] == profile[attribute] for field, attribute in CONDITIONS if field in rule):
+                return index
+        return None
+
+    def eligible_schemes(self, occupation, gender, age_band):
+        index = self.match_rule(occupation, gender, age_band)
+        return self.rule_results[index] if index is not None else ()
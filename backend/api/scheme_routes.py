@@ -1,11 +1,15 @@
 from flask import Blueprint, request, jsonify
-import json
+from .catalog import get_catalog
+from .scheme_buckets import find_schemes_for_profile
+from .scheme_search import search_schemes, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 scheme_bp = Blueprint('schemes', __name__)
 
-def load_schemes():
-    with open('data/schemes.json', 'r') as f:
-        return json.load(f)
+@scheme_bp.after_request
+def add_catalog_version(response):
+    # Content digest of the scheme files the response was built from
+    response.headers['X-Catalog-Version'] = get_catalog('schemes').snapshot().digest
+    return response
 
 @scheme_bp.route('/find', methods=['POST'])
 def find_schemes():
@@ -17,53 +21,36 @@ def find_schemes():
         if not data.get(field):
             return jsonify({'error': f'{field} is required'}), 400
     
-    schemes_data = load_schemes()
-    schemes = schemes_data.get('schemes', [])
-    matching_schemes = []
-    
-    # Show all schemes without filtering by type
-    for scheme in schemes:
-        # Intelligent matching based on user profile
-        if data['occupation'] == 'Student':
-            # Students get education and skill development schemes
-            if any(keyword in scheme['category'].lower() for keyword in ['education', 'scholarship', 'skill']):
-                matching_schemes.append(scheme)
-        elif data['occupation'] == 'Farmer':
-            # Farmers get agricultural and rural schemes
-            if any(keyword in scheme['category'].lower() for keyword in ['agricultural', 'crop', 'rural', 'kisan']):
-                matching_schemes.append(scheme)
-        elif data['occupation'] == 'Homemaker':
-            # Homemakers get women empowerment and family schemes
-            if any(keyword in scheme['category'].lower() for keyword in ['women', 'maternity', 'family', 'social security']):
-                matching_schemes.append(scheme)
-        elif data['occupation'] == 'Employee' or data['occupation'] == 'Self Employed':
-            # Working people get skill development and entrepreneurship schemes
-            if any(keyword in scheme['category'].lower() for keyword in ['skill', 'entrepreneurship', 'pension']):
-                matching_schemes.append(scheme)
-        elif data['occupation'] == 'Business Owner':
-            # Business owners get entrepreneurship and startup schemes
-            if any(keyword in scheme['category'].lower() for keyword in ['entrepreneurship', 'startup', 'skill']):
-                matching_schemes.append(scheme)
-        elif data['occupation'] == 'Retired':
-            # Retired people get pension and health schemes
-            if any(keyword in scheme['category'].lower() for keyword in ['pension', 'health', 'social security']):
-                matching_schemes.append(scheme)
-        else:
-            # For other occupations, show relevant schemes based on age and gender
-            if data['age'] >= 60:
-                # Elderly people get pension and health schemes
-                if any(keyword in scheme['category'].lower() for keyword in ['pension', 'health', 'social security']):
-                    matching_schemes.append(scheme)
-            elif data['gender'] == 'Female':
-                # Women get women empowerment schemes
-                if any(keyword in scheme['category'].lower() for keyword in ['women', 'maternity', 'girl child']):
-                    matching_schemes.append(scheme)
-            else:
-                # Others get general schemes (limit to 5-10 most relevant)
-                if len(matching_schemes) < 8:
-                    matching_schemes.append(scheme)
+    # Ranked matches are precomputed per occupation x gender x age band bucket
+    matching_schemes = find_schemes_for_profile(data['occupation'], data['gender'], data['age'])
     
     return jsonify({
         'schemes': matching_schemes,
         'total': len(matching_schemes)
-    }), 200 
\ No newline at end of file
+    }), 200 
+
+@scheme_bp.route('/search', methods=['GET'])
+def search_scheme_catalog():
+    """
+    Paginated full-text search over scheme names, categories, descriptions and access details
+    """
+    query = request.args.get('q', '')
+    state = request.args.get('state')
+
+    try:
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('pageSize', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'page and pageSize must be integers'}), 400
+
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+    results, total = search_schemes(query, page=page, page_size=page_size, state=state)
+
+    return jsonify({
+        'query': query,
+        'schemes': results,
+        'total': total,
+        'page': page,
+        'pageSize': page_size
+    }), 200
@@ -0,0 +1,292 @@
+"""
+Full-text scheme search: a BM25-ranked inverted index over each scheme's name, category,
+description and access values (portals, helplines, emails).
+
+Tokens are NFC-normalized runs of letters, digits and combining marks, so Indic words keep
+their vowel signs ("किसान" is one token, not three). Query words in Indian languages or
+romanized Hindi are expanded to the English terms the catalog uses, from
+data/scheme_search_terms.json.
+
+The index follows the catalog loaded by scheme_buckets. A published index is never modified:
+on reload a new one is built on a copy, sharing the postings of terms no changed scheme
+touches, and swapped in with one reference assignment, so searches running on the old
+index are unaffected.
+"""
+import hashlib
+import heapq
+import json
+import logging
+import math
+import re
+import threading
+import unicodedata
+from .catalog import data_path, register
+from .scheme_buckets import get_all_schemes
+
+logger = logging.getLogger(__name__)
+
+TERMS_FILE = data_path('scheme_search_terms.json')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term frequency weight per field: a hit in the scheme name outranks one in the description
+FIELD_WEIGHTS = {'schemeName': 3.0, 'category': 2.0, 'access': 1.5, 'description': 1.0}
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+
+# Letters/digits (\w) plus combining marks of the Arabic and Indic scripts, minus the dandas
+_TOKEN = re.compile(r'(?:[^\W_]|[\u064b-\u065f\u0670\u0900-\u0963\u0966-\u0dff])+')
+_JOINERS = dict.fromkeys((0x200c, 0x200d))
+
+
+def normalize(text):
+    return unicodedata.normalize('NFC', (text or '').translate(_JOINERS)).lower()
+
+
+def stem(token):
+    """
+    Light English plural stripping ("girls" -> "girl"); other scripts are left alone
+    """
+    if not token.isascii() or len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def compile_terms(data):
+    """
+    (stopwords, expansions) with every word normalized like query tokens
+    """
+    stopwords = frozenset(normalize(word) for word in data.get('stopwords', []))
+    expansions = {
+        normalize(word): tuple(stem(normalize(term)) for term in terms)
+        for word, terms in data.get('expansions', {}).items()
+    }
+    return stopwords, expansions
+
+
+_terms = register('scheme_search_terms', [TERMS_FILE], compile_terms)
+
+
+def tokenize(text, stopwords=frozenset()):
+    return [stem(token) for token in _TOKEN.findall(normalize(text)) if token not in stopwords]
+
+
+def scheme_fields(scheme):
+    """
+    Searchable text per field; phone numbers are also indexed without separators
+    """
+    access = []
+    for entry in scheme.get('access', []):
+        value = entry.get('value') or ''
+        access.append(value)
+        digits = ''.join(ch for ch in value if ch.isdigit())
+        if len(digits) >= 4 and digits != value:
+            access.append(digits)
+    return {
+        'schemeName': scheme.get('schemeName', ''),
+        'category': scheme.get('category', ''),
+        'description': scheme.get('description', ''),
+        'access': ' '.join(access)
+    }
+
+
+def scheme_key(scheme):
+    return hashlib.sha256(json.dumps(scheme, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class SchemeSearchIndex:
+    """
+    Inverted index (term -> {doc_id: weighted term frequency}) with per-document lengths.
+    Schemes are added and removed only while an index is being built (see updated()).
+    """
+
+    def __init__(self, stopwords=frozenset(), expansions=None):
+        self.stopwords = stopwords
+        self.expansions = expansions or {}
+        self.postings = {}
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0.0
+        self.documents = {}
+        self.positions = {}
+        self.keys = {}
+        self.next_id = 0
+        # Terms whose postings dict belongs to this index; others may be shared with the index it was copied from
+        self._owned_terms = set()
+
+    def _writable_postings(self, term):
+        postings = self.postings.get(term)
+        if postings is None or term not in self._owned_terms:
+            postings = dict(postings) if postings else {}
+            self.postings[term] = postings
+            self._owned_terms.add(term)
+        return postings
+
+    def add(self, scheme):
+        doc_id = self.next_id
+        self.next_id += 1
+
+        frequencies = {}
+        for field, text in scheme_fields(scheme).items():
+            for token in tokenize(text, self.stopwords):
+                frequencies[token] = frequencies.get(token, 0.0) + FIELD_WEIGHTS[field]
+        for term, frequency in frequencies.items():
+            self._writable_postings(term)[doc_id] = frequency
+
+        length = sum(frequencies.values())
+        self.doc_terms[doc_id] = tuple(frequencies)
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        self.documents[doc_id] = scheme
+        return doc_id
+
+    def remove(self, doc_id):
+        for term in self.doc_terms.pop(doc_id):
+            postings = self._writable_postings(term)
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        del self.documents[doc_id]
+
+    def copy(self):
+        """
+        Shallow copy: postings dicts are shared until the copy first changes them
+        """
+        index = SchemeSearchIndex(self.stopwords, self.expansions)
+        index.postings = dict(self.postings)
+        index.doc_terms = dict(self.doc_terms)
+        index.doc_lengths = dict(self.doc_lengths)
+        index.total_length = self.total_length
+        index.documents = dict(self.documents)
+        index.keys = dict(self.keys)
+        index.next_id = self.next_id
+        return index
+
+    def updated(self, schemes):
+        """
+        New index for a (re)loaded catalog, leaving this one untouched; unchanged schemes keep
+        their postings. Returns (index, added, removed).
+        """
+        wanted = {}
+        for position, scheme in enumerate(schemes):
+            wanted.setdefault(scheme_key(scheme), []).append((position, scheme))
+
+        index = self.copy()
+        positions = {}
+        removed = 0
+        for doc_id, key in self.keys.items():
+            if wanted.get(key):
+                position, _ = wanted[key].pop(0)
+                positions[doc_id] = position
+            else:
+                index.remove(doc_id)
+                del index.keys[doc_id]
+                removed += 1
+
+        added = 0
+        for key, entries in wanted.items():
+            for position, scheme in entries:
+                doc_id = index.add(scheme)
+                index.keys[doc_id] = key
+                positions[doc_id] = position
+                added += 1
+        index.positions = positions
+        return index, added, removed
+
+    def query_terms(self, query):
+        terms = []
+        for token in _TOKEN.findall(normalize(query)):
+            if token in self.stopwords:
+                continue
+            for term in (stem(token),) + self.expansions.get(token, ()):
+                if term not in terms:
+                    terms.append(term)
+        digits = ''.join(ch for ch in query if ch.isdigit())
+        if len(digits) >= 4 and digits not in terms:
+            terms.append(digits)
+        return terms
+
+    def scores(self, terms, state=None):
+        count = len(self.documents)
+        if not count:
+            return {}
+        average_length = self.total_length / count
+
+        scores = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = K1 * (1.0 - B + B * self.doc_lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (K1 + 1.0) / (frequency + norm)
+
+        if state:
+            scores = {
+                doc_id: score for doc_id, score in scores.items()
+                if self.documents[doc_id].get('level') == 'Central' or self.documents[doc_id].get('state') == state
+            }
+        return scores
+
+    def search(self, query, page=1, page_size=DEFAULT_PAGE_SIZE, state=None):
+        """
+        One page of schemes ranked by BM25 (catalog order on ties), and the total match count.
+        `state` limits results to central schemes plus that state's.
+        """
+        scores = self.scores(self.query_terms(query), state)
+        top = heapq.nsmallest(
+            page * page_size,
+            scores.items(),
+            key=lambda item: (-item[1], self.positions[item[0]])
+        )
+
+        results = []
+        for doc_id, score in top[(page - 1) * page_size:]:
+            result = dict(self.documents[doc_id])
+            result['score'] = round(score, 3)
+            results.append(result)
+        return results, len(scores)
+
+
+# (schemes, terms, index) published as one tuple, so readers never see a mismatched set
+_lock = threading.Lock()
+_current = {'published': (None, None, None)}
+
+
+def get_scheme_search_index():
+    """
+    Search index for the current scheme catalog, updated incrementally when the catalog reloads
+    (rebuilt when the search terms change)
+    """
+    schemes = get_all_schemes()
+    terms = _terms.get()
+    published = _current['published']
+    if published[0] is schemes and published[1] is terms:
+        return published[2]
+
+    with _lock:
+        published = _current['published']
+        if published[0] is not schemes or published[1] is not terms:
+            base = published[2] if published[1] is terms else SchemeSearchIndex(*terms)
+            index, added, removed = base.updated(schemes)
+            published = _current['published'] = (schemes, terms, index)
+            logger.info("🔎 Scheme search index: %d schemes (%d added, %d removed)", len(index.documents), added, removed)
+    return published[2]
+
+
+def search_schemes(query, page=1, page_size=DEFAULT_PAGE_SIZE, state=None):
+    return get_scheme_search_index().search(
+        query,
+        page=max(page, 1),
+        page_size=min(max(page_size, 1), MAX_PAGE_SIZE),
+        state=state
+    )
@@ -0,0 +1,213 @@
+"""
+Static asset layer for the React build (frontend_build/).
+
+Content-hashed files (main.bafbcde5.js, offline shards) and index.html are scanned once at
+startup into a path -> asset map, so serving them needs no per-request stat. Each asset
+carries identity, gzip and (with the Brotli package) br variants; the smallest one the
+client accepts is sent. Hashed files are cached as immutable; index.html is revalidated
+against its ETag. Small files live in memory, larger ones are sent from disk.
+
+Precompress the build once after `npm run build` (maximum compression levels, written
+as .gz/.br siblings that startup picks up instead of compressing in memory):
+
+    python -m api.static_assets [--root frontend_build]
+"""
+import argparse
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from flask import Response, send_file
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # br variants are optional
+    brotli = None
+
+ASSET_ROOT = 'frontend_build'
+INDEX = 'index.html'
+
+# Files up to this size are held in memory; larger ones are sent from disk
+MEMORY_MAX_BYTES = int(os.getenv('STATIC_MEMORY_MAX_BYTES', str(512 * 1024)))
+
+# Smaller files are not worth a compressed variant
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE = ('.js', '.css', '.html', '.json', '.map', '.txt', '.svg')
+
+# Negotiation preference when the client accepts several encodings equally
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Source maps are JSON
+mimetypes.add_type('application/json', '.map')
+
+# name.<content hash>.ext, as produced by the React build and the offline bundle
+_HASHED = re.compile(r'\.[0-9a-f]{8,}\.[^/]+$')
+
+
+def is_hashed_asset(path):
+    """
+    True for content-hashed file names, which never change content and are cached forever
+    """
+    return bool(_HASHED.search(path))
+
+
+def compress(body, encoding, best=False):
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+    return brotli.compress(body, quality=11 if best else 5)
+
+
+class Asset:
+    """
+    One file: its variants by content-encoding (bytes in memory, or paths on disk)
+    """
+
+    def __init__(self, path, mimetype, etag, immutable, variants):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.immutable = immutable
+        self.variants = variants
+
+    def select(self, accept_encodings):
+        best = 'identity'
+        best_quality = 0
+        for encoding, _ in ENCODINGS:
+            quality = accept_encodings.quality(encoding)
+            if encoding in self.variants and quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def response(self, request):
+        encoding = self.select(request.accept_encodings)
+        body = self.variants[encoding]
+        if isinstance(body, bytes):
+            response = Response(body, mimetype=self.mimetype)
+        else:
+            response = send_file(body, mimetype=self.mimetype, conditional=False, etag=False)
+
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        if len(self.variants) > 1:
+            response.vary.add('Accept-Encoding')
+        response.set_etag(self.etag if encoding == 'identity' else f'{self.etag}-{encoding}')
+        response.headers['Cache-Control'] = IMMUTABLE if self.immutable else REVALIDATE
+        return response.make_conditional(request)
+
+
+def load_asset(root, relative):
+    """
+    Read one file and its compressed variants (precompressed siblings when up to date)
+    """
+    path = os.path.join(root, relative)
+    with open(path, 'rb') as f:
+        body = f.read()
+    in_memory = len(body) <= MEMORY_MAX_BYTES
+    mimetype = mimetypes.guess_type(relative)[0] or 'application/octet-stream'
+
+    variants = {'identity': body if in_memory else path}
+    if relative.endswith(COMPRESSIBLE) and len(body) >= MIN_COMPRESS_BYTES:
+        source_mtime = os.path.getmtime(path)
+        for encoding, suffix in ENCODINGS:
+            sibling = path + suffix
+            if os.path.exists(sibling) and os.path.getmtime(sibling) >= source_mtime:
+                if in_memory:
+                    with open(sibling, 'rb') as f:
+                        variants[encoding] = f.read()
+                else:
+                    variants[encoding] = sibling
+            elif in_memory and (encoding == 'gzip' or brotli is not None):
+                variants[encoding] = compress(body, encoding)
+
+        # Keep a compressed variant only if it is actually smaller
+        for encoding, _ in ENCODINGS:
+            variant = variants.get(encoding)
+            if variant is not None:
+                size = len(variant) if isinstance(variant, bytes) else os.path.getsize(variant)
+                if size >= len(body):
+                    del variants[encoding]
+
+    etag = hashlib.sha256(body).hexdigest()[:20]
+    return Asset(relative, mimetype, etag, is_hashed_asset(relative), variants)
+
+
+def iter_servable(root):
+    """
+    Relative paths of the files pinned at startup: hashed assets and index.html.
+    Other files (e.g. the offline manifest, rewritten by the exporter) may change while
+    the server runs, so they are served from disk.
+    """
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(('.gz', '.br')):
+                continue
+            relative = os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/')
+            if relative == INDEX or is_hashed_asset(relative):
+                yield relative
+
+
+class StaticAssets:
+    """
+    Path -> Asset map built once from the build directory
+    """
+
+    def __init__(self, root=ASSET_ROOT):
+        self.root = root
+        self.assets = {}
+        if os.path.isdir(root):
+            for relative in iter_servable(root):
+                self.assets[relative] = load_asset(root, relative)
+
+        in_memory = sum(len(asset.variants['identity']) for asset in self.assets.values()
+                        if isinstance(asset.variants['identity'], bytes))
+        logger.info("🗜️ Static assets: %d files pinned (%.0f KB in memory)%s",
+                    len(self.assets), in_memory / 1024, "" if brotli else ", brotli unavailable")
+
+    def response(self, path, request):
+        """
+        Response for a pinned asset, or None if the path is not in the map
+        """
+        asset = self.assets.get(path)
+        if asset is None:
+            return None
+        return asset.response(request)
+
+
+def precompress(root=ASSET_ROOT):
+    """
+    Write .gz/.br siblings at the highest compression levels for every pinned asset
+    """
+    written = 0
+    for relative in iter_servable(root):
+        if not relative.endswith(COMPRESSIBLE):
+            continue
+        path = os.path.join(root, relative)
+        with open(path, 'rb') as f:
+            body = f.read()
+        if len(body) < MIN_COMPRESS_BYTES:
+            continue
+        for encoding, suffix in ENCODINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            with open(path + suffix, 'wb') as f:
+                f.write(compress(body, encoding, best=True))
+            written += 1
+    print(f"🗜️ Wrote {written} precompressed files under {root}" + ("" if brotli else " (gzip only, brotli not installed)"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompress the React build for static serving')
+    parser.add_argument('--root', default=ASSET_ROOT)
+    args = parser.parse_args()
+    precompress(args.root)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,48 @@
 from flask import Blueprint, request, jsonify
 import json
+import logging
 import os
+from .gemini_metrics import track_gemini_call, failure_outcome
+from .classification_rules import get_rules
+from .helpline_directory import get_directory
+
+logger = logging.getLogger(__name__)
 
 voice_bp = Blueprint('voice', __name__)
 
+# National helplines returned when Gemini's answer cannot be parsed (112, police, ambulance)
+FALLBACK_HELPLINES = 3
+
+def voice_analysis_prompt(text, language, national):
+    """
+    Gemini prompt for picking the helplines relevant to a voice transcript
+    """
+    helpline_lines = '\n'.join(f'        - {name}: {number}' for name, number in national)
+    return f"""
+        Analyze this voice input and determine the most relevant national helpline numbers for India.
+        
+        Voice Input: "{text}"
+        Language: {language}
+        
+        Available National Helpline Numbers:
+{helpline_lines}
+        
+        Please analyze the situation and return ONLY the relevant helpline numbers in JSON format:
+        {{
+            "relevant_helplines": {{
+                "helpline_name": "number",
+                ...
+            }},
+            "analysis": {{
+                "problem_type": "description",
+                "urgency_level": "high/medium/low",
+                "recommendations": ["list of recommendations"]
+            }}
+        }}
+        
+        Only include helpline numbers that are directly relevant to the described situation.
+        """
+
 @voice_bp.route('/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'service': 'Voice Processing'})
@@ -32,12 +71,19 @@ def get_language_support():
 @voice_bp.route('/voice-to-text', methods=['POST'])
 def voice_to_text():
     """Process voice input and return relevant national helpline numbers using AI analysis"""
+    call = track_gemini_call('voice_to_text')
     try:
         data = request.get_json()
         text = data.get('text', '')
         state = data.get('state', '')
         language = data.get('language', 'hi-IN')
         
+        # National helplines for the prompt and the fallback, plus native-language lines for the state
+        rules = get_rules()
+        directory = get_directory()
+        national = directory.national_helplines(rules)
+        localized = directory.localized_helplines(rules.language_codes.get(language, rules.default_language), state or '')
+        
         # Import Gemini AI for analysis
         import google.generativeai as genai
         import os
@@ -47,47 +93,13 @@ def voice_to_text():
         model = genai.GenerativeModel('gemini-pro')
         
         # Create AI prompt for analysis
-        prompt = f"""
-        Analyze this voice input and determine the most relevant national helpline numbers for India.
-        
-        Voice Input: "{text}"
-        Language: {language}
-        
-        Available National Helpline Numbers:
-        - Emergency: 112
-        - Ambulance: 108
-        - Police: 100
-        - Fire: 101
-        - Women Helpline: 1091
-        - Child Helpline: 1098
-        - Senior Citizen: 14567
-        - Mental Health: 1800-599-0019
-        - Cyber Crime: 1930
-        - Consumer Helpline: 1800-11-4000
-        - Farmer Helpline: 1800-180-1551
-        - Railway Helpline: 139
-        - Health Helpline: 104
-        - COVID Helpline: 1075
-        
-        Please analyze the situation and return ONLY the relevant helpline numbers in JSON format:
-        {{
-            "relevant_helplines": {{
-                "helpline_name": "number",
-                ...
-            }},
-            "analysis": {{
-                "problem_type": "description",
-                "urgency_level": "high/medium/low",
-                "recommendations": ["list of recommendations"]
-            }}
-        }}
-        
-        Only include helpline numbers that are directly relevant to the described situation.
-        """
+        prompt = voice_analysis_prompt(text, language, national)
         
         # Get AI analysis
+        call.begin(prompt)
         response = model.generate_content(prompt)
         ai_response = response.text
+        call.response_received(ai_response, response)
         
         # Parse AI response (fallback to basic analysis if parsing fails)
         try:
@@ -99,16 +111,14 @@ def voice_to_text():
                 ai_data = json.loads(ai_response[start_idx:end_idx])
                 relevant_helplines = ai_data.get('relevant_helplines', {})
                 analysis = ai_data.get('analysis', {})
+                call.finish('ok')
             else:
                 raise ValueError("No JSON found in response")
         except Exception as parse_error:
-            print(f"Error parsing AI response: {parse_error}")
+            logger.warning("Could not parse Gemini voice analysis response: %s", parse_error)
+            call.finish('parse_failure')
             # Fallback to basic emergency numbers
-            relevant_helplines = {
-                'emergency': '112',
-                'ambulance': '108',
-                'police': '100'
-            }
+            relevant_helplines = dict(national[:FALLBACK_HELPLINES])
             analysis = {
                 'problem_type': 'Emergency',
                 'urgency_level': 'high',
@@ -120,6 +130,7 @@ def voice_to_text():
             'text': text,
             'language': language,
             'state_helplines': relevant_helplines,
+            'localized_helplines': localized,
             'ai_analysis': {
                 'problem_type': analysis.get('problem_type', 'Emergency'),
                 'urgency_level': analysis.get('urgency_level', 'high'),
@@ -130,6 +141,7 @@ def voice_to_text():
         })
         
     except Exception as e:
+        call.finish(failure_outcome(e, default='error'))
         return jsonify({
             'success': False,
             'error': str(e)
@@ -138,12 +150,19 @@ def voice_to_text():
 @voice_bp.route('/analyze-with-gemini', methods=['POST'])
 def analyze_with_gemini():
     """Analyze voice input with Gemini AI and return relevant national helpline numbers"""
+    call = track_gemini_call('voice_analysis')
     try:
         data = request.get_json()
         text = data.get('text', '')
         state = data.get('state', '')
         language = data.get('language', 'hi-IN')
         
+        # National helplines for the prompt and the fallback, plus native-language lines for the state
+        rules = get_rules()
+        directory = get_directory()
+        national = directory.national_helplines(rules)
+        localized = directory.localized_helplines(rules.language_codes.get(language, rules.default_language), state or '')
+        
         # Import Gemini AI for analysis
         import google.generativeai as genai
         import os
@@ -153,47 +172,13 @@ def analyze_with_gemini():
         model = genai.GenerativeModel('gemini-pro')
         
         # Create AI prompt for analysis
-        prompt = f"""
-        Analyze this voice input and determine the most relevant national helpline numbers for India.
-        
-        Voice Input: "{text}"
-        Language: {language}
-        
-        Available National Helpline Numbers:
-        - Emergency: 112
-        - Ambulance: 108
-        - Police: 100
-        - Fire: 101
-        - Women Helpline: 1091
-        - Child Helpline: 1098
-        - Senior Citizen: 14567
-        - Mental Health: 1800-599-0019
-        - Cyber Crime: 1930
-        - Consumer Helpline: 1800-11-4000
-        - Farmer Helpline: 1800-180-1551
-        - Railway Helpline: 139
-        - Health Helpline: 104
-        - COVID Helpline: 1075
-        
-        Please analyze the situation and return ONLY the relevant helpline numbers in JSON format:
-        {{
-            "relevant_helplines": {{
-                "helpline_name": "number",
-                ...
-            }},
-            "analysis": {{
-                "problem_type": "description",
-                "urgency_level": "high/medium/low",
-                "recommendations": ["list of recommendations"]
-            }}
-        }}
-        
-        Only include helpline numbers that are directly relevant to the described situation.
-        """
+        prompt = voice_analysis_prompt(text, language, national)
         
         # Get AI analysis
+        call.begin(prompt)
         response = model.generate_content(prompt)
         ai_response = response.text
+        call.response_received(ai_response, response)
         
         # Parse AI response (fallback to basic analysis if parsing fails)
         try:
@@ -205,16 +190,14 @@ def analyze_with_gemini():
                 ai_data = json.loads(ai_response[start_idx:end_idx])
                 relevant_helplines = ai_data.get('relevant_helplines', {})
                 analysis = ai_data.get('analysis', {})
+                call.finish('ok')
             else:
                 raise ValueError("No JSON found in response")
         except Exception as parse_error:
-            print(f"Error parsing AI response: {parse_error}")
+            logger.warning("Could not parse Gemini voice analysis response: %s", parse_error)
+            call.finish('parse_failure')
             # Fallback to basic emergency numbers
-            relevant_helplines = {
-                'emergency': '112',
-                'ambulance': '108',
-                'police': '100'
-            }
+            relevant_helplines = dict(national[:FALLBACK_HELPLINES])
             analysis = {
                 'problem_type': 'Emergency',
                 'urgency_level': 'high',
@@ -226,6 +209,7 @@ def analyze_with_gemini():
             'text': text,
             'language': language,
             'state_helplines': relevant_helplines,
+            'localized_helplines': localized,
             'ai_analysis': {
                 'problem_type': analysis.get('problem_type', 'Emergency'),
                 'urgency_level': analysis.get('urgency_level', 'high'),
@@ -236,6 +220,7 @@ def analyze_with_gemini():
         })
         
     except Exception as e:
+        call.finish(failure_outcome(e, default='error'))
         return jsonify({
             'success': False,
             'error': str(e)
@@ -0,0 +1,214 @@
+"""
+Throughput and accuracy benchmark for the keyword fallback analyzers.
+
+Runs the labeled corpus (benchmarks/corpus/fallback_corpus.json, 12 languages) through
+the emergency analyzer behind process_without_ai and through intelligent_fallback_analysis,
+and reports texts/sec, p50/p99 latency and per-class precision/recall as JSON. The
+corpus's mixed texts (e.g. a child hurt in a fire) are checked for every expected type and
+helpline; the run exits non-zero when one is missing.
+
+Run from the backend directory:
+    python benchmarks/bench_fallback_analyzers.py [--iterations N] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..'))
+
+from api.emergency_routes import analyze_emergency_text
+from api.emergency_scorer import MIN_SECONDARY_CONFIDENCE
+from api.ai_routes import intelligent_fallback_analysis
+
+CORPUS_FILE = os.path.join(BENCHMARK_DIR, 'corpus', 'fallback_corpus.json')
+
+# Language name -> code the clients send
+LANGUAGE_CODES = {
+    'Hindi': 'hi-IN', 'Tamil': 'ta-IN', 'Telugu': 'te-IN', 'Bengali': 'bn-IN',
+    'Marathi': 'mr-IN', 'Gujarati': 'gu-IN', 'Kannada': 'kn-IN', 'Malayalam': 'ml-IN',
+    'Punjabi': 'pa-IN', 'Urdu': 'ur-IN', 'English': 'en-IN', 'Odia': 'or-IN'
+}
+
+# intelligent_fallback_analysis problemType -> corpus label
+PROBLEM_TYPE_LABELS = {
+    'Women Safety': 'women',
+    'Child Protection': 'child',
+    'Transport Emergency': 'transport',
+    'Transport': 'transport',
+    'Medical Emergency': 'medical',
+    'Healthcare': 'medical',
+    'Water Supply': 'water',
+    'Electricity - Delhi': 'electricity',
+    'Electricity': 'electricity',
+    'Crime/Police': 'police',
+    'Fire Emergency': 'fire',
+    'General': 'general'
+}
+
+
+def emergency_label(sample):
+    return analyze_emergency_text(sample['text'], LANGUAGE_CODES[sample['language']])['emergencyType']
+
+
+def problem_label(sample):
+    result = intelligent_fallback_analysis(sample['text'], LANGUAGE_CODES[sample['language']], 'India', None)
+    return PROBLEM_TYPE_LABELS.get(result['problemType'], result['problemType'])
+
+
+ANALYZERS = {
+    'process_without_ai': emergency_label,
+    'intelligent_fallback_analysis': problem_label
+}
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def score(samples, predictions):
+    """
+    Accuracy, per-class precision/recall and per-language accuracy
+    """
+    labels = sorted({sample['label'] for sample in samples} | set(predictions))
+    per_class = {}
+    for label in labels:
+        true_positive = sum(1 for s, p in zip(samples, predictions) if s['label'] == label and p == label)
+        predicted = sum(1 for p in predictions if p == label)
+        support = sum(1 for s in samples if s['label'] == label)
+        per_class[label] = {
+            'precision': round(true_positive / predicted, 3) if predicted else 0.0,
+            'recall': round(true_positive / support, 3) if support else 0.0,
+            'support': support
+        }
+
+    per_language = {}
+    for sample, prediction in zip(samples, predictions):
+        stats = per_language.setdefault(sample['language'], {'correct': 0, 'total': 0})
+        stats['total'] += 1
+        stats['correct'] += prediction == sample['label']
+    for stats in per_language.values():
+        stats['accuracy'] = round(stats['correct'] / stats['total'], 3)
+
+    correct = sum(1 for s, p in zip(samples, predictions) if s['label'] == p)
+    return {
+        'accuracy': round(correct / len(samples), 3),
+        'perClass': per_class,
+        'perLanguage': per_language,
+        'errors': [
+            {'language': s['language'], 'label': s['label'], 'predicted': p, 'text': s['text']}
+            for s, p in zip(samples, predictions) if s['label'] != p
+        ]
+    }
+
+
+def benchmark(analyzer, samples, iterations):
+    # Warm up (compiles the rules registry) and collect predictions
+    predictions = [analyzer(sample) for sample in samples]
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for sample in samples:
+            t0 = time.perf_counter()
+            analyzer(sample)
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    result = {
+        'textsPerSec': round(len(latencies) / elapsed, 1),
+        'p50Us': round(percentile(latencies, 0.50) * 1e6, 1),
+        'p99Us': round(percentile(latencies, 0.99) * 1e6, 1)
+    }
+    result.update(score(samples, predictions))
+    return result
+
+
+def mixed_failures(mixed):
+    """
+    Mixed texts whose surfaced types/helplines miss an expected one or include an excluded one
+    """
+    failures = []
+    for sample in mixed:
+        result = analyze_emergency_text(sample['text'], LANGUAGE_CODES[sample['language']])
+        ranked = result['emergencyTypes']
+        surfaced = {ranked[0]['type']} if ranked else set()
+        surfaced |= {label['type'] for label in ranked[1:] if label['confidence'] >= MIN_SECONDARY_CONFIDENCE}
+        numbers = {helpline['number'] for helpline in result['helplineNumbers']}
+        missing = sorted(set(sample['types']) - surfaced) + sorted(set(sample['helplines']) - numbers)
+        unexpected = sorted(surfaced & set(sample.get('absent', ())))
+        if missing or unexpected:
+            failures.append({'language': sample['language'], 'text': sample['text'],
+                             'missing': missing, 'unexpected': unexpected})
+    return failures
+
+
+def compare(results, baseline):
+    """
+    Human-readable regressions against a previous results file
+    """
+    for name, current in results['analyzers'].items():
+        previous = baseline.get('analyzers', {}).get(name)
+        if not previous:
+            continue
+        print(f"{name}: accuracy {previous['accuracy']:.3f} -> {current['accuracy']:.3f}, "
+              f"texts/sec {previous['textsPerSec']:,.0f} -> {current['textsPerSec']:,.0f}, "
+              f"p99 {previous['p99Us']:.0f}us -> {current['p99Us']:.0f}us")
+        for label, stats in current['perClass'].items():
+            old = previous['perClass'].get(label)
+            if old and (stats['recall'] < old['recall'] or stats['precision'] < old['precision']):
+                print(f"  {label}: recall {old['recall']} -> {stats['recall']}, "
+                      f"precision {old['precision']} -> {stats['precision']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--corpus', default=CORPUS_FILE)
+    parser.add_argument('--output', help='write JSON results here instead of stdout')
+    parser.add_argument('--baseline', help='previous JSON results to compare against')
+    args = parser.parse_args()
+
+    with open(args.corpus, 'rb') as f:
+        raw = f.read()
+    corpus = json.loads(raw.decode('utf-8'))
+    samples = corpus['samples']
+
+    results = {
+        'corpus': {
+            'sha256': hashlib.sha256(raw).hexdigest()[:16],
+            'samples': len(samples),
+            'languages': sorted({sample['language'] for sample in samples})
+        },
+        'iterations': args.iterations,
+        'analyzers': {name: benchmark(analyzer, samples, args.iterations) for name, analyzer in ANALYZERS.items()},
+        'mixedFailures': mixed_failures(corpus.get('mixed', []))
+    }
+
+    output = json.dumps(results, indent=2, ensure_ascii=False, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        for name, result in results['analyzers'].items():
+            print(f"{name}: accuracy {result['accuracy']:.3f}, {result['textsPerSec']:,.0f} texts/sec, "
+                  f"p99 {result['p99Us']:.0f}us")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+    for failure in results['mixedFailures']:
+        print(f"FAIL: mixed {failure['language']} text {failure['text']!r}: missing {failure['missing']}, "
+              f"unexpected {failure['unexpected']}")
+    sys.exit(1 if results['mixedFailures'] else 0)
+
+
+if __name__ == '__main__':
+    main()
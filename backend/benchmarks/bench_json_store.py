@@ -0,0 +1,94 @@
+"""
+Benchmark: stdlib json (indent=2, the old store format) vs the JSON provider
+(orjson when installed, compact) on a synthetic 100k-complaint store.
+
+Complaints are sampled from data/complaints.json with fresh ids. Run from the backend directory:
+    python benchmarks/bench_json_store.py [--complaints 100000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from api.complaint_routes import COMPLAINTS_FILE
+from api.json_provider import orjson, dumps_bytes, read_json, write_json
+
+
+def synthetic_store(size):
+    rng = random.Random(42)
+    history = read_json(COMPLAINTS_FILE)
+    complaints = []
+    for i in range(size):
+        complaint = dict(rng.choice(history))
+        complaint['id'] = f'JANAI-{i:06d}'
+        complaint['userId'] = str(rng.randint(1, size // 50 or 1))
+        complaints.append(complaint)
+    return complaints
+
+
+def timed(fn, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def stdlib_write(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def stdlib_read(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--complaints', type=int, default=100000)
+    args = parser.parse_args()
+
+    complaints = synthetic_store(args.complaints)
+    # One user's complaint history, as /api/complaint/status returns it
+    page = complaints[:1000]
+
+    with tempfile.TemporaryDirectory() as directory:
+        old_path = os.path.join(directory, 'complaints_stdlib.json')
+        new_path = os.path.join(directory, 'complaints_provider.json')
+
+        write_old, _ = timed(lambda: stdlib_write(old_path, complaints))
+        write_new, _ = timed(lambda: write_json(new_path, complaints))
+        read_old, loaded_old = timed(lambda: stdlib_read(old_path))
+        read_new, loaded_new = timed(lambda: read_json(new_path))
+        if loaded_old != loaded_new:
+            raise SystemExit('stores differ after a round trip')
+        size_old = os.path.getsize(old_path)
+        size_new = os.path.getsize(new_path)
+
+    # jsonify: Flask's default provider (ensure_ascii, sorted, compact) vs the provider
+    response_old, _ = timed(lambda: json.dumps({'complaints': page}, ensure_ascii=True, sort_keys=True, separators=(',', ':')), repeat=20)
+    response_new, _ = timed(lambda: dumps_bytes({'complaints': page}, sort_keys=True), repeat=20)
+
+    print(f"{len(complaints):,} complaints, encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json'}")
+    rows = (
+        ('store write', write_old, write_new),
+        ('store read', read_old, read_new),
+        ('jsonify 1,000 complaints', response_old, response_new),
+    )
+    print(f"  {'':<26}{'stdlib':>12}{'provider':>12}{'speedup':>10}")
+    for name, old, new in rows:
+        print(f"  {name:<26}{old:>10.1f}ms{new:>10.1f}ms{old / new:>9.1f}x")
+    print(f"  {'store size':<26}{size_old / 1e6:>10.1f}MB{size_new / 1e6:>10.1f}MB{size_old / size_new:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
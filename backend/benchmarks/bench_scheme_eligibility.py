@@ -0,0 +1,88 @@
+"""
+Benchmark: bitset eligibility engine vs per-scheme keyword scans on a large synthetic catalog.
+
+Run from the backend directory:
+    python benchmarks/bench_scheme_eligibility.py [--schemes N]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from api.scheme_buckets import SCHEMES_FILE, ELIGIBILITY_FILE, build_bucket_table
+from api.scheme_eligibility import EligibilityEngine
+
+
+def legacy_rank(schemes, keywords, general_limit):
+    """
+    What each bucket did before: lowercase every category and test every keyword
+    """
+    if keywords is None:
+        return tuple(schemes[:general_limit])
+    scored = []
+    for position, scheme in enumerate(schemes):
+        category = scheme.get('category', '').lower()
+        hits = sum(1 for keyword in keywords if keyword in category)
+        if hits:
+            scored.append((-hits, position, scheme))
+    scored.sort(key=lambda item: (item[0], item[1]))
+    return tuple(scheme for _, _, scheme in scored)
+
+
+def legacy_table(schemes, engine):
+    table = {}
+    for occupation in engine.occupations:
+        for gender in engine.genders:
+            for age_band, _ in engine.age_bands:
+                index = engine.match_rule(occupation, gender, age_band)
+                keywords = engine.rules[index].get('categoryKeywords') if index is not None else ()
+                table[(occupation, gender, age_band)] = legacy_rank(schemes, keywords, engine.general_limit)
+    return table
+
+
+def synthetic_catalog(schemes, size):
+    """
+    Catalog of `size` schemes with categories drawn from the real ones, plus state variants
+    """
+    rng = random.Random(42)
+    catalog = []
+    for i in range(size):
+        template = rng.choice(schemes)
+        catalog.append(dict(template, schemeName=f"{template['schemeName']} #{i}"))
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--schemes', type=int, default=5000)
+    args = parser.parse_args()
+
+    with open(SCHEMES_FILE, 'r') as f:
+        schemes = synthetic_catalog(json.load(f)['schemes'], args.schemes)
+    with open(ELIGIBILITY_FILE, 'r') as f:
+        config = json.load(f)
+
+    start = time.perf_counter()
+    engine = EligibilityEngine(schemes, config)
+    table = build_bucket_table(engine)
+    bitset_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    expected = legacy_table(schemes, engine)
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    if table != expected:
+        raise SystemExit('bitset engine and per-scheme scans disagree')
+
+    print(f"{len(schemes)} schemes, {len(engine.rules)} rules, {len(engine.keyword_masks)} keyword bitsets, {len(table)} buckets")
+    print(f"  per-scheme scans   {legacy_ms:>10.1f} ms")
+    print(f"  bitset engine      {bitset_ms:>10.1f} ms")
+    print(f"  speedup            {legacy_ms / bitset_ms:>10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Load benchmark: Werkzeug dev server (python main.py) vs gunicorn (gunicorn.conf.py).
+
+Starts each server on a free port, replays a mix of helpline, scheme and emergency
+requests from concurrent clients, and reports requests/sec and latency percentiles.
+Run from the backend directory:
+    python benchmarks/bench_server_load.py [--requests 2000] [--concurrency 32] [--workers 4]
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+WORKLOAD = [
+    ('GET', '/api/helpline?state=Haryana', None),
+    ('GET', '/api/helpline/search?q=ambul', None),
+    ('GET', '/api/schemes/search?q=scholarship%20for%20girls', None),
+    ('POST', '/api/schemes/find', {'name': 'Asha', 'age': 34, 'gender': 'Female', 'occupation': 'Farmer'}),
+    ('POST', '/api/emergency/process-emergency', {'text': 'मेरे घर में आग लग गई है जल्दी मदद करो', 'language': 'hi-IN', 'state': 'Maharashtra'}),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/api')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f'server on port {port} did not start')
+
+
+def send(port, method, path, payload):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else None
+    headers = {'Content-Type': 'application/json'} if body else {}
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        ok = response.status < 500
+    except OSError:
+        ok = False
+    finally:
+        connection.close()
+    return time.perf_counter() - start, ok
+
+
+def run_load(port, requests, concurrency):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        method, path, payload = WORKLOAD[i % len(WORKLOAD)]
+        elapsed, ok = send(port, method, path, payload)
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    # Warm-up pass so lazily built per-worker state is not measured
+    for i in range(len(WORKLOAD) * 4):
+        one(i)
+    latencies.clear()
+    errors = 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requestsPerSec': round(requests / elapsed, 1),
+        'p50Ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'p99Ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+        'errors': errors
+    }
+
+
+def benchmark(name, command, env, args):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), CATALOG_WATCH_INTERVAL='0', GEMINI_METRICS_DUMP_INTERVAL='0', **env)
+    process = subprocess.Popen(
+        command, cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        wait_until_ready(port)
+        result = run_load(port, args.requests, args.concurrency)
+    finally:
+        # The dev server's reloader runs the app in a child process, so stop the whole group
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    print(f"  {name:<28} {result['requestsPerSec']:>9,.1f} req/s   p50 {result['p50Ms']:>7.2f} ms   "
+          f"p99 {result['p99Ms']:>8.2f} ms   errors {result['errors']}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    # Keyword fallbacks only: measure the server, not Gemini
+    offline = {'GEMINI_API_KEY': ''}
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients, {len(WORKLOAD)} routes")
+    results = {
+        'dev server': benchmark('python main.py (dev server)', [sys.executable, 'main.py'], offline, args),
+        'gunicorn': benchmark(
+            f'gunicorn ({args.workers} workers)',
+            [sys.executable, '-m', 'gunicorn', '--access-logfile', os.devnull],
+            dict(offline, WEB_CONCURRENCY=str(args.workers)),
+            args
+        )
+    }
+    speedup = results['gunicorn']['requestsPerSec'] / results['dev server']['requestsPerSec']
+    print(f"  speedup {speedup:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
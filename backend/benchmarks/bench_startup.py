@@ -0,0 +1,95 @@
+"""
+Startup benchmark: time to import main and run create_app() in a fresh interpreter,
+with an import-time report (python -X importtime, summed per top-level package).
+
+Exits non-zero when the median boot time is over the budget, or when a module that is
+meant to load lazily (Gemini SDK, Flask-Mail) was imported during boot. Run from the
+backend directory:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 600] [--top 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Loaded on the first AI call / email send, never at boot
+LAZY_MODULES = ('google.generativeai', 'flask_mail')
+
+BOOT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.create_app()
+ready = time.perf_counter()
+print(json.dumps({{
+    'importMs': (imported - start) * 1000,
+    'createAppMs': (ready - imported) * 1000,
+    'eagerLazyModules': [name for name in {LAZY_MODULES!r} if name in sys.modules]
+}}))
+"""
+
+
+def boot(importtime=False):
+    """
+    One cold boot in a subprocess: (timings dict, importtime stderr lines)
+    """
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', BOOT_SCRIPT]
+    result = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f'boot failed:\n{result.stderr}')
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, result.stderr.splitlines()
+
+
+def import_report(lines, top):
+    """
+    Import time (ms) per top-level package, summing each module's self time from
+    -X importtime output so nested imports are not counted twice
+    """
+    packages = {}
+    for line in lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(own) / 1000
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('STARTUP_BUDGET_MS', '600')))
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    _, importtime_lines = boot(importtime=True)
+    print('Import time by top-level package:')
+    for package, ms in import_report(importtime_lines, args.top):
+        print(f'  {package:<32}{ms:>9.1f}ms')
+
+    runs = [boot()[0] for _ in range(args.runs)]
+    import_ms = statistics.median(run['importMs'] for run in runs)
+    create_ms = statistics.median(run['createAppMs'] for run in runs)
+    boot_ms = statistics.median(run['importMs'] + run['createAppMs'] for run in runs)
+    print(f'\n{args.runs} cold boots (median): import main {import_ms:.0f}ms, '
+          f'create_app() {create_ms:.0f}ms, total {boot_ms:.0f}ms (budget {args.budget_ms:.0f}ms)')
+
+    failures = []
+    eager = sorted({name for run in runs for name in run['eagerLazyModules']})
+    if eager:
+        failures.append(f"imported at boot but meant to load lazily: {', '.join(eager)}")
+    if boot_ms > args.budget_ms:
+        failures.append(f'boot time {boot_ms:.0f}ms is over the {args.budget_ms:.0f}ms budget')
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Production server configuration. Run from the backend directory:
+
+    gunicorn
+
+The app is built once in the master (preload) so catalogs, search indexes and the
+complaint classifier are shared copy-on-write by the forked workers. Most request time
+is spent waiting on Gemini and SMTP, so each worker serves requests on a thread pool
+(gthread); GUNICORN_WORKER_CLASS=gevent switches to greenlets when gevent is installed.
+
+Environment:
+    PORT                        listen port (5000)
+    WEB_CONCURRENCY             worker processes (2 x CPUs + 1)
+    GUNICORN_THREADS            threads per gthread worker (8)
+    GUNICORN_WORKER_CLASS       gthread (default) or gevent
+    GUNICORN_TIMEOUT            seconds before a silent worker is restarted (120, Gemini calls are slow)
+    ADMISSION_BACKEND=shared    rate-limit buckets shared by all workers instead of per worker
+"""
+import gc
+import multiprocessing
+import os
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'gevent':
+    try:
+        # Patch before the app (and its HTTP/gRPC clients) is imported by preload
+        from gevent import monkey
+        monkey.patch_all()
+        try:
+            from grpc.experimental import gevent as grpc_gevent
+            grpc_gevent.init_gevent()
+        except ImportError:
+            pass
+    except ImportError:
+        print("⚠️ gevent is not installed, using gthread workers")
+        worker_class = 'gthread'
+
+wsgi_app = 'main:create_app()'
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+worker_connections = 1000
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so slow leaks cannot accumulate; jitter avoids restarting all at once
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    # Objects created while preloading move to the permanent generation, so the
+    # collector in each worker never touches (and copies) the shared pages
+    gc.freeze()
+    server.log.info("🚀 JanAI ready with %s %s worker(s)", workers, worker_class)
+
+
+def post_fork(server, worker):
+    from main import start_background_tasks
+    start_background_tasks()
+
+
+def worker_exit(server, worker):
+    from main import flush_on_shutdown
+    flush_on_shutdown()
@@ -1,6 +1,8 @@
-from flask import Flask, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
+import logging
 import os
 from api.auth_routes import auth_bp
 from api.complaint_routes import complaint_bp
@@ -10,44 +12,164 @@ from api.ai_routes import ai_bp
 from api.voice_routes import voice_bp
 from api.emergency_routes import emergency_bp
 from api.email_service import init_mail
+from api.json_provider import init_json
+from api.logging_setup import init_logging, configure_logging, stop_logging
+from api.compression import init_compression, get_compression_stats
+from api.metrics import init_metrics, render_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from api.profiling import init_profiling, profile_summary, profiles_listed, can_read_profiles
+from api.admission import init_admission
+from api.gemini_metrics import start_metrics_dump, dump_gemini_stats
+from api.catalog import start_watcher, catalog_versions
+from api.classification_rules import get_rules
+from api.complaint_classifier import load_classifier
+from api.helpline_index import load_helpline_index
+from api.helpline_search import get_search_index
+from api.scheme_search import get_scheme_search_index
+from api.static_assets import StaticAssets, is_hashed_asset
 
 # Load environment variables
 load_dotenv()
 
-# Point static_folder to React build folder inside backend
-app = Flask(__name__, static_folder='frontend_build')
-CORS(app)
-
-# Initialize email service with error handling
-try:
-    init_mail(app)
-except Exception as e:
-    print(f"⚠️ Email service initialization failed: {e}")
-    print("📧 Email features will be disabled. Please check your .env file configuration.")
-
-# Register blueprints
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-app.register_blueprint(complaint_bp, url_prefix='/api/complaint')
-app.register_blueprint(scheme_bp, url_prefix='/api/schemes')
-app.register_blueprint(helpline_bp, url_prefix='/api/helpline')
-app.register_blueprint(ai_bp, url_prefix='/api/ai')
-app.register_blueprint(voice_bp, url_prefix='/api/voice')
-app.register_blueprint(emergency_bp, url_prefix='/api/emergency')
-
-# Backend API test route
-@app.route('/api')
-def api_test():
-    return {'message': 'JanAI Backend API is running!'}
-
-# Serve React frontend
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve_frontend(path):
-    if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    else:
-        return send_from_directory(app.static_folder, 'index.html')
+logger = logging.getLogger(__name__)
+
+
+def start_background_tasks():
+    """
+    Per-process background threads. Threads do not survive fork, so under gunicorn these
+    start in each worker (post_fork), not in the preloading master.
+    """
+    # Periodically dump Gemini usage accounting (GEMINI_METRICS_DUMP_INTERVAL=0 disables)
+    start_metrics_dump()
+
+    # Swap in new catalog snapshots when the data files change (CATALOG_WATCH_INTERVAL=0 disables)
+    start_watcher()
+
+
+def flush_on_shutdown():
+    """
+    Write out in-memory state that would otherwise be lost when a worker exits
+    """
+    try:
+        dump_gemini_stats()
+    except Exception as e:
+        logger.warning("Gemini metrics flush failed: %s", e)
+    # Last, so the records above are written too
+    stop_logging()
+
+
+def create_app():
+    """
+    Build the Flask app and warm every catalog, index and model it serves from, so a
+    preloading server shares them copy-on-write across its forked workers
+    """
+    # Point static_folder to React build folder inside backend
+    app = Flask(__name__, static_folder='frontend_build')
+
+    # Client address and scheme from X-Forwarded-* when behind TRUSTED_PROXY_HOPS reverse proxies
+    proxy_hops = int(os.getenv('TRUSTED_PROXY_HOPS', '0'))
+    if proxy_hops > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops)
+
+    # JSON log lines with request IDs, written by a background thread (LOG_LEVEL, LOG_LEVELS)
+    init_logging(app)
+
+    CORS(app)
+
+    # Request counts, status codes, latency and in-flight requests for GET /metrics
+    init_metrics(app)
+
+    # Opt-in cProfile/stack sampling of single requests (PROFILE_TOKEN, PROFILE_SAMPLE_RATE)
+    init_profiling(app)
+
+    # Per-IP token buckets for the Gemini and email endpoints (ADMISSION_BACKEND)
+    init_admission(app)
+
+    # orjson for jsonify and request bodies when installed
+    init_json(app)
+
+    # Initialize email service with error handling
+    try:
+        init_mail(app)
+    except Exception as e:
+        logger.warning("⚠️ Email service initialization failed: %s", e)
+        logger.warning("📧 Email features will be disabled. Please check your .env file configuration.")
+
+    # gzip/brotli for large JSON API responses (COMPRESSION_MIN_BYTES)
+    init_compression(app)
+
+    # Compile the emergency/problem classification rules once at startup (reloaded by the catalog watcher)
+    get_rules()
+
+    # Offline-trained complaint category classifier (python -m api.complaint_classifier train)
+    load_classifier()
+
+    # Per-state helpline responses, prebuilt and serialized once (rebuilt when helpline.json changes)
+    load_helpline_index()
+    get_search_index()
+
+    # BM25 scheme search index (synced incrementally when schemes.json changes)
+    get_scheme_search_index()
+
+    # Register blueprints
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(complaint_bp, url_prefix='/api/complaint')
+    app.register_blueprint(scheme_bp, url_prefix='/api/schemes')
+    app.register_blueprint(helpline_bp, url_prefix='/api/helpline')
+    app.register_blueprint(ai_bp, url_prefix='/api/ai')
+    app.register_blueprint(voice_bp, url_prefix='/api/voice')
+    app.register_blueprint(emergency_bp, url_prefix='/api/emergency')
+
+    # Backend API test route
+    @app.route('/api')
+    def api_test():
+        return {'message': 'JanAI Backend API is running!', 'catalogs': catalog_versions()}
+
+    # Per-route compression ratio and CPU cost, for tuning the thresholds
+    @app.route('/api/compression-stats')
+    def compression_stats():
+        return get_compression_stats()
+
+    # Prometheus scrape target (per process: each gunicorn worker reports its own series)
+    @app.route('/metrics')
+    def metrics():
+        return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+    # Top functions across the newest spooled request profiles
+    @app.route('/api/profiles')
+    def profiles():
+        if not profiles_listed():
+            return jsonify({'error': 'Not found'}), 404
+        if not can_read_profiles(request):
+            return jsonify({'error': 'X-Profile token required'}), 403
+        limit = request.args.get('limit', 20, type=int)
+        top = request.args.get('top', 25, type=int)
+        return profile_summary(limit, top)
+
+    # Hashed build files and index.html, pinned (and precompressed) once at startup
+    assets = StaticAssets(app.static_folder)
+
+    # Serve React frontend
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve_frontend(path):
+        response = assets.response(path or 'index.html', request)
+        if response is not None:
+            return response
+        if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
+            # Files added after startup, e.g. a re-exported offline bundle
+            response = send_from_directory(app.static_folder, path)
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable' if is_hashed_asset(path) else 'no-cache'
+            return response
+        else:
+            return assets.response('index.html', request) or send_from_directory(app.static_folder, 'index.html')
+
+    return app
+
 
 if __name__ == '__main__':
-    print("🚀 Starting JanAI Fullstack Server...")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server; production runs under gunicorn (see gunicorn.conf.py)
+    configure_logging()
+    logger.info("🚀 Starting JanAI Fullstack Server...")
+    app = create_app()
+    start_background_tasks()
+    app.run(debug=True, host='0.0.0.0', port=int(os.getenv('PORT', '5000')))
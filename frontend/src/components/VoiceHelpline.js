@@ -1,7 +1,13 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import './VoiceHelpline.css';
-
-const VoiceHelpline = ({ onHelplineResult }) => {
+import {
+  getOfflineHelplines,
+  getRememberedState,
+  prefetchOfflineHelplines,
+  rememberOfflineState,
+} from '../services/offlineHelplines';
+
+const VoiceHelpline = ({ onHelplineResult, userState }) => {
   const [isRecording, setIsRecording] = useState(false);
   const [voiceText, setVoiceText] = useState('');
   const [detectedLanguage, setDetectedLanguage] = useState('');
@@ -62,6 +68,7 @@ const VoiceHelpline = ({ onHelplineResult }) => {
         setDetectedState(data.detectedState);
         setEmergencyType(data.emergencyType);
         setHelplineNumbers(data.helplineNumbers);
+        rememberOfflineState(data.detectedState);
 
         // Show fallback message if AI was unavailable
         if (data.note) {
@@ -85,11 +92,28 @@ const VoiceHelpline = ({ onHelplineResult }) => {
       }
     } catch (error) {
       console.error('Voice processing error:', error);
-      setError('Failed to process voice input. Please check your internet connection and try again.');
+      try {
+        // API unreachable: fall back to the helplines stored from the offline bundle
+        const offline = await getOfflineHelplines(userState || getRememberedState(), 'general', selectedLanguage);
+        setDetectedLanguage(offline.detectedLanguage);
+        setDetectedState(offline.detectedState);
+        setEmergencyType(offline.emergencyType);
+        setHelplineNumbers(offline.helplineNumbers);
+        setError('Could not analyze your request. Showing saved emergency helplines.');
+      } catch (offlineError) {
+        setError('Failed to process voice input. Please check your internet connection and try again.');
+      }
     } finally {
       setIsProcessing(false);
     }
-  }, [selectedLanguage, onHelplineResult]);
+  }, [selectedLanguage, onHelplineResult, userState]);
+
+  // Store the offline helplines for this state and language while the network is up
+  useEffect(() => {
+    prefetchOfflineHelplines(userState, selectedLanguage).catch((prefetchError) => {
+      console.warn('Offline helplines not cached:', prefetchError.message);
+    });
+  }, [userState, selectedLanguage]);
 
   // Initialize speech recognition
   const initializeSpeechRecognition = useCallback(() => {
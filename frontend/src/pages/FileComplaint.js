@@ -46,6 +46,8 @@ const FileComplaint = ({ user }) => {
 
   const fileInputRef = useRef(null);
   const recognitionRef = useRef(null);
+  // Idempotency key of the submission in flight, reused while its payload is unchanged
+  const submissionRef = useRef(null);
 
   // Check browser compatibility
   const isSpeechRecognitionSupported = () => {
@@ -345,7 +347,13 @@ const FileComplaint = ({ user }) => {
       }
       
       console.log('DEBUG: Final complaintData being sent:', complaintData);
-      const response = await complaintAPI.fileComplaint(complaintData);
+      const payload = JSON.stringify(complaintData);
+      if (!submissionRef.current || submissionRef.current.payload !== payload) {
+        const key = window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+        submissionRef.current = { payload, key };
+      }
+      const response = await complaintAPI.fileComplaint(complaintData, submissionRef.current.key);
+      submissionRef.current = null;
       setSuccess(response);
       // Reset form
       setFormData({
@@ -139,6 +139,7 @@ const Helpline = ({ user }) => {
       <div className="helpline-container">
         {/* Voice Emergency Helpline */}
         <VoiceHelpline 
+          userState={selectedState}
           onHelplineResult={(result) => {
             console.log('Voice emergency result:', result);
             // Optionally auto-select state based on detection
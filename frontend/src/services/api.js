@@ -4,11 +4,11 @@ const API_BASE_URL = 'http://localhost:5000/api';
 const apiCall = async (endpoint, options = {}) => {
   const url = `${API_BASE_URL}${endpoint}`;
   const config = {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
       ...options.headers,
     },
-    ...options,
   };
 
   try {
@@ -45,9 +45,11 @@ export const authAPI = {
 
 // Complaint APIs
 export const complaintAPI = {
-  fileComplaint: async (complaintData) => {
+  // Retries of the same submission reuse idempotencyKey, so the server files it only once
+  fileComplaint: async (complaintData, idempotencyKey) => {
     return apiCall('/complaint/file', {
       method: 'POST',
+      headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : {},
       body: JSON.stringify(complaintData),
     });
   },
@@ -81,6 +83,13 @@ export const schemesAPI = {
       body: JSON.stringify(userData),
     });
   },
+
+  searchSchemes: async (query, page = 1, state) => {
+    const stateParam = state ? `&state=${encodeURIComponent(state)}` : '';
+    return apiCall(`/schemes/search?q=${encodeURIComponent(query)}&page=${page}${stateParam}`, {
+      method: 'GET',
+    });
+  },
 };
 
 // Helpline APIs
@@ -90,6 +99,13 @@ export const helplineAPI = {
       method: 'GET',
     });
   },
+
+  searchHelplines: async (query, state) => {
+    const stateParam = state ? `&state=${encodeURIComponent(state)}` : '';
+    return apiCall(`/helpline/search?q=${encodeURIComponent(query)}${stateParam}`, {
+      method: 'GET',
+    });
+  },
 };
 
 // Voice Processing APIs
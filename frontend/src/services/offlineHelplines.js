@@ -0,0 +1,141 @@
+// Offline emergency helplines exported by `python -m api.offline_bundle`.
+// While online, prefetchOfflineHelplines() copies the manifest and the shards the user needs
+// (national and their state's helplines, responses in their language) into localStorage,
+// so lookups keep working once the network or the API is gone.
+const OFFLINE_BASE_URL = '/offline';
+const NATIONAL = 'All India';
+const STORAGE_PREFIX = 'offline:';
+const MANIFEST_KEY = `${STORAGE_PREFIX}manifest.json`;
+const STATE_KEY = `${STORAGE_PREFIX}state`;
+
+let manifestPromise = null;
+const shardCache = {};
+
+const fetchJson = async (url) => {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Offline bundle unavailable: ${url}`);
+  }
+  return response.json();
+};
+
+const readStored = (key) => {
+  try {
+    const stored = localStorage.getItem(key);
+    return stored ? JSON.parse(stored) : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+const writeStored = (key, value) => {
+  try {
+    localStorage.setItem(key, JSON.stringify(value));
+  } catch (error) {
+    // Storage full or disabled: the in-memory copy still serves this session
+  }
+};
+
+// Shard names the manifest references; stored shards from older builds are dropped
+const pruneStoredShards = (manifest) => {
+  const current = new Set([
+    manifest.helplines,
+    ...Object.values(manifest.states),
+    ...Object.values(manifest.responses),
+  ]);
+  try {
+    Object.keys(localStorage)
+      .filter((key) => key.startsWith(STORAGE_PREFIX) && key.endsWith('.json') && key !== MANIFEST_KEY)
+      .filter((key) => !current.has(key.slice(STORAGE_PREFIX.length)))
+      .forEach((key) => localStorage.removeItem(key));
+  } catch (error) {
+    // Storage disabled: nothing was stored either
+  }
+};
+
+// The manifest is revalidated on every load; the stored copy is used when it cannot be fetched
+const loadManifest = () => {
+  if (!manifestPromise) {
+    manifestPromise = fetchJson(`${OFFLINE_BASE_URL}/manifest.json`)
+      .then((manifest) => {
+        writeStored(MANIFEST_KEY, manifest);
+        pruneStoredShards(manifest);
+        return manifest;
+      })
+      .catch((error) => {
+        manifestPromise = null;
+        const stored = readStored(MANIFEST_KEY);
+        if (stored) {
+          return stored;
+        }
+        throw error;
+      });
+  }
+  return manifestPromise;
+};
+
+// Shards are content-hashed, so a stored copy never goes stale
+const loadShard = (name) => {
+  if (!shardCache[name]) {
+    const stored = readStored(`${STORAGE_PREFIX}${name}`);
+    shardCache[name] = stored
+      ? Promise.resolve(stored)
+      : fetchJson(`${OFFLINE_BASE_URL}/${name}`)
+          .then((shard) => {
+            writeStored(`${STORAGE_PREFIX}${name}`, shard);
+            return shard;
+          })
+          .catch((error) => {
+            delete shardCache[name];
+            throw error;
+          });
+  }
+  return shardCache[name];
+};
+
+const languageName = (manifest, languageCode) => manifest.languageCodes[languageCode] || 'English';
+
+// State the user last picked or was detected in, for offline lookups without one
+export const rememberOfflineState = (state) => {
+  if (state && state !== NATIONAL) {
+    writeStored(STATE_KEY, state);
+  }
+};
+
+export const getRememberedState = () => readStored(STATE_KEY) || NATIONAL;
+
+// Fetch and store everything an offline lookup for this state and language needs
+export const prefetchOfflineHelplines = async (state, languageCode = 'en-IN') => {
+  rememberOfflineState(state);
+  const manifest = await loadManifest();
+  const states = [NATIONAL, state || getRememberedState()].filter((name) => manifest.states[name]);
+  const language = languageName(manifest, languageCode);
+  await Promise.all([
+    loadShard(manifest.helplines),
+    ...states.map((name) => loadShard(manifest.states[name])),
+    loadShard(manifest.responses[language] || manifest.responses.English),
+  ]);
+};
+
+// Helplines and response text for a state, emergency type and language code (e.g. 'hi-IN')
+export const getOfflineHelplines = async (state, emergencyType = 'general', languageCode = 'en-IN') => {
+  const manifest = await loadManifest();
+  const stateShard = manifest.states[state] || manifest.states[NATIONAL];
+  const language = languageName(manifest, languageCode);
+  const responseShard = manifest.responses[language] || manifest.responses.English;
+
+  const [helplines, table, responses] = await Promise.all([
+    loadShard(manifest.helplines),
+    loadShard(stateShard),
+    loadShard(responseShard),
+  ]);
+
+  const type = table[emergencyType] ? emergencyType : 'general';
+  return {
+    detectedLanguage: language,
+    detectedState: manifest.states[state] ? state : NATIONAL,
+    emergencyType: type,
+    helplineNumbers: table[type].map((index) => helplines[index]),
+    translatedResponse: responses[type],
+  };
+};